@@ -0,0 +1,126 @@
+from queue import Queue, Empty, Full
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+from jobAPI import AbstractJobAPI
+from vacancies import Vacancy
+
+_DONE = object()  # Метка завершения источника в очереди страниц
+
+
+class JobSource:
+    """
+    Класс JobSource описывает зарегистрированный источник вакансий:
+    реализацию AbstractJobAPI, её имя, таймаут и дополнительные параметры запроса.
+    """
+    def __init__(self, name: str, api: AbstractJobAPI, timeout: Optional[float] = None, **params):
+        self.name = name
+        self.api = api
+        self.timeout = timeout
+        self.params = params
+
+
+class VacancyAggregator:
+    """
+    Класс VacancyAggregator опрашивает все зарегистрированные источники вакансий параллельно
+    и объединяет их результаты в один поток объектов Vacancy.
+
+    Время поиска определяется самым медленным источником, а не суммой всех.
+    Страницы отдаются сразу по мере загрузки. Если источник вернул ошибку или не уложился
+    в таймаут, его дальнейшие страницы пропускаются, а результаты остальных источников
+    возвращаются (ошибки сохраняются в errors).
+    """
+    def __init__(self, default_timeout: Optional[float] = 30.0):
+        self.default_timeout = default_timeout
+        self.sources: List[JobSource] = []
+        self.errors: Dict[str, Exception] = {}
+
+    def register(self, api: AbstractJobAPI, name: Optional[str] = None, timeout: Optional[float] = None,
+                 **params) -> None:
+        """Регистрирует источник вакансий."""
+        if not isinstance(api, AbstractJobAPI):
+            raise TypeError("Источник должен реализовывать AbstractJobAPI.")
+        timeout = timeout if timeout is not None else self.default_timeout
+        self.sources.append(JobSource(name or type(api).__name__, api, timeout, **params))
+
+    def iter_pages(self, search_query: str) -> Iterator[List[dict]]:
+        """
+        Запускает поиск во всех источниках одновременно и отдаёт страницы результатов
+        по мере их поступления из любого источника.
+        Очередь страниц ограничена, поэтому источники не обгоняют потребителя.
+        """
+        self.errors = {}
+        if not self.sources:
+            return
+
+        pages: Queue = Queue(maxsize=2 * len(self.sources))
+        stop = threading.Event()
+        stopped_sources = set()
+        started = time.monotonic()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def worker(source: JobSource) -> None:
+            try:
+                for page in source.api.iter_pages(search_query, **source.params):
+                    if source in stopped_sources or not put((source, page)):
+                        return
+            except Exception as e:
+                put((source, e))
+            finally:
+                put((source, _DONE))
+
+        for source in self.sources:
+            threading.Thread(target=worker, args=(source,), daemon=True).start()
+
+        active = set(self.sources)
+        try:
+            while active:
+                now = time.monotonic()
+                for source in [s for s in active if self._deadline(s, started) <= now]:
+                    active.discard(source)
+                    stopped_sources.add(source)
+                    self.errors[source.name] = TimeoutError(f"превышен таймаут {source.timeout} с")
+                    print(f"Источник {source.name} не ответил за {source.timeout} с.")
+                if not active:
+                    break
+
+                next_deadline = min(self._deadline(s, started) for s in active)
+                wait_for = None if next_deadline == float("inf") else max(0.0, next_deadline - now)
+                try:
+                    source, page = pages.get(timeout=wait_for)
+                except Empty:
+                    continue
+                if source not in active:
+                    continue
+                if page is _DONE:
+                    active.discard(source)
+                elif isinstance(page, Exception):
+                    self.errors[source.name] = page
+                    print(f"Ошибка источника {source.name}: {page}")
+                else:
+                    yield page
+        finally:
+            stop.set()
+
+    def iter_vacancies(self, search_query: str) -> Iterator[Vacancy]:
+        """Отдаёт вакансии всех источников одним потоком по мере загрузки страниц."""
+        for page in self.iter_pages(search_query):
+            for item in page:
+                yield Vacancy(**item)
+
+    def search(self, search_query: str) -> List[Vacancy]:
+        """Возвращает объединённый список вакансий из всех источников."""
+        return list(self.iter_vacancies(search_query))
+
+    @staticmethod
+    def _deadline(source: JobSource, started: float) -> float:
+        """Момент времени, после которого источник считается не ответившим."""
+        return started + source.timeout if source.timeout is not None else float("inf")
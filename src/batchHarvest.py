@@ -0,0 +1,278 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+import requests
+from dedup import add_source, exact_key
+from hhAPI import HeadHunterAPI
+from httpCache import ResponseCache
+from instrumentation import instrument_run, metrics
+from jobAPI import AbstractJobAPI
+from jsonSaver import AbstractVacancySaver, JSONSaver, keyword_phrases, salary_key, search_fields, to_record
+from jsonlSaver import JSONLSaver
+from keywordIndex import tokenize
+from requestScheduler import RequestScheduler
+from sjAPI import SuperJobAPI
+from sqliteSaver import SQLiteSaver
+from vacancies import Vacancy
+
+SOURCES = ("hh", "sj")
+# Нормализованная запись: запись хранилища, ключ дубликата (или None), слова полей поиска
+Normalized = Tuple[Dict, Optional[str], FrozenSet[str]]
+
+
+def normalize_chunk(items: List[dict], collect_metrics: bool = False) -> Tuple[List[Normalized], Optional[Dict]]:
+    """
+    Нормализует пачку вакансий из ответов API (выполняется в процессах пула):
+    очистка HTML, зарплата в рублях, ключ дубликата и слова для фильтрации.
+    Метрики процесса пула не видны основному процессу, поэтому при collect_metrics
+    вместе с результатом возвращается сводка метрик этой пачки (для metrics.merge).
+    """
+    if collect_metrics:
+        metrics.reset()
+        metrics.enable()
+    try:
+        result = []
+        with metrics.span("harvest.normalize_chunk"):
+            for item in items:
+                record = to_record(Vacancy(**item))
+                tokens = frozenset(token for text in search_fields(record) for token in tokenize(text))
+                result.append((record, exact_key(record), tokens))
+        return result, metrics.summary() if collect_metrics else None
+    finally:
+        if collect_metrics:
+            metrics.disable()
+
+
+def load_queries(path: str) -> List[dict]:
+    """
+    Читает файл запросов: JSON-список или по одному JSON-объекту в строке.
+    Поля запроса: query (обязательно), source (hh, sj или all), filters (список слов
+    или строка через запятую), salary_from и salary_to (в рублях), top, max_results, params.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        text = file.read()
+    if text.lstrip().startswith("["):
+        raw_queries = json.loads(text)
+    else:
+        raw_queries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    queries = []
+    for number, raw in enumerate(raw_queries, 1):
+        if isinstance(raw, str):
+            raw = {"query": raw}
+        if not raw.get("query"):
+            raise ValueError(f"Запрос №{number} в {path}: не указано поле query.")
+        filters = raw.get("filters") or []
+        if isinstance(filters, str):
+            filters = filters.split(",")
+        queries.append({**raw, "filters": filters})
+    return queries
+
+
+def open_store(path: str) -> AbstractVacancySaver:
+    """Открывает хранилище по расширению файла: .db/.sqlite — SQLite, .jsonl — журнал, иначе JSON."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteSaver(path)
+    if extension == ".jsonl":
+        return JSONLSaver(path)
+    return JSONSaver(path)
+
+
+class BatchHarvester:
+    """
+    Класс BatchHarvester собирает вакансии по набору запросов без участия пользователя.
+
+    Запросы обрабатываются пачками по batch_size: загрузка по всем парам (запрос, источник)
+    идёт параллельно в fetch_workers потоках, каждая загруженная выдача сразу делится
+    на части по chunk_size и отправляется на нормализацию в пул процессов (processes),
+    поэтому разбор HTML и зарплат масштабируется по ядрам и идёт одновременно с загрузкой.
+    Затем к каждому запросу применяются фильтры слов, границы зарплаты, удаление дубликатов
+    и top N, а все отобранные вакансии пачки сохраняются одной пакетной записью.
+    Метрики нормализации собираются в процессах пула и добавляются к метрикам основного процесса.
+    """
+    def __init__(self, saver: AbstractVacancySaver, apis: Dict[str, AbstractJobAPI],
+                 fetch_workers: int = 8, processes: Optional[int] = None, chunk_size: int = 500,
+                 batch_size: int = 50, max_results: int = 500, default_source: str = "hh"):
+        self.saver = saver
+        self.apis = apis
+        self.fetch_workers = fetch_workers
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.max_results = max_results
+        self.default_source = default_source
+        self.stats = {"queries": 0, "fetch_failures": 0, "fetched": 0, "selected": 0, "written": 0}
+
+    def sources(self, query: dict) -> List[str]:
+        """Источники запроса, для которых есть клиент API."""
+        source = query.get("source") or self.default_source
+        names = SOURCES if source == "all" else [source]
+        missing = [name for name in names if name not in self.apis]
+        if missing and source != "all":
+            print(f"Источник {', '.join(missing)} недоступен, запрос '{query['query']}' пропущен.")
+        return [name for name in names if name in self.apis]
+
+    def fetch(self, query: dict, source: str) -> List[dict]:
+        """Загружает вакансии одного запроса из одного источника."""
+        api = self.apis[source]
+        max_results = query.get("max_results") or self.max_results
+        if source == "sj":
+            limits = {"count": SuperJobAPI.MAX_PER_PAGE, "max_pages": math.ceil(max_results / SuperJobAPI.MAX_PER_PAGE)}
+        else:
+            limits = {"max_results": max_results}
+        items = []
+        for page in api.iter_pages(query["query"], **{**(query.get("params") or {}), **limits}):
+            items.extend(page)
+        return items[:max_results]
+
+    def chunks(self, items: List, size: int) -> Iterator[List]:
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    def select(self, query: dict, normalized: List[Normalized]) -> List[Dict]:
+        """Применяет к нормализованным вакансиям фильтры запроса и возвращает отобранные записи."""
+        phrases = keyword_phrases(query["filters"])
+        salary_from, salary_to = query.get("salary_from"), query.get("salary_to")
+        canonical: Dict[str, Dict] = {}
+        records = []
+        for record, key, tokens in normalized:
+            if phrases and not any(phrase <= tokens for phrase in phrases):
+                continue
+            salary = record["salary_rub"]
+            if salary_from is not None and (salary is None or salary < salary_from):
+                continue
+            if salary_to is not None and (salary is None or salary > salary_to):
+                continue
+            if key is not None:
+                if key in canonical:
+                    add_source(canonical[key], record)
+                    continue
+                canonical[key] = record
+            records.append(record)
+        top = query.get("top")
+        return heapq.nlargest(top, records, key=salary_key) if top else records
+
+    def run_batch(self, queries: List[dict], fetcher: ThreadPoolExecutor, pool: ProcessPoolExecutor) -> None:
+        """Загружает, нормализует и сохраняет одну пачку запросов."""
+        fetches = {fetcher.submit(self.fetch, query, source): (position, source)
+                   for position, query in enumerate(queries) for source in self.sources(query)}
+        normalizing = []
+        for future in as_completed(fetches):
+            position, source = fetches[future]
+            try:
+                items = future.result()
+            except requests.exceptions.RequestException as e:
+                print(f"Ошибка загрузки '{queries[position]['query']}' из {source}: {e}")
+                self.stats["fetch_failures"] += 1
+                continue
+            self.stats["fetched"] += len(items)
+            for chunk in self.chunks(items, self.chunk_size):
+                normalizing.append((position, source, pool.submit(normalize_chunk, chunk, metrics.enabled)))
+
+        # Результаты собираются в порядке запросов и источников, чтобы отбор не зависел от скорости загрузки
+        normalized: Dict[int, List[Normalized]] = {position: [] for position in range(len(queries))}
+        normalizing.sort(key=lambda task: (task[0], SOURCES.index(task[1])))
+        with metrics.span("harvest.normalize"):
+            for position, _, future in normalizing:
+                chunk, chunk_metrics = future.result()
+                normalized[position].extend(chunk)
+                if chunk_metrics is not None:
+                    metrics.merge(chunk_metrics)
+
+        records = {}
+        for position, query in enumerate(queries):
+            for record in self.select(query, normalized[position]):
+                records.setdefault((record["title"], record["link"]), record)
+        self.stats["queries"] += len(queries)
+        self.stats["selected"] += len(records)
+        if records:
+            with metrics.span("harvest.write"):
+                self.stats["written"] += self.saver.add_records(records.values())
+
+    def run(self, queries: List[dict]) -> Dict[str, float]:
+        """Обрабатывает все запросы и возвращает сводку с пропускной способностью."""
+        started = time.perf_counter()
+        # Процессы пула запускаются без fork: иначе дочерний процесс может унаследовать
+        # блокировку (например, metrics._lock), захваченную потоком загрузки
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetcher, \
+                ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for batch in self.chunks(queries, self.batch_size):
+                self.run_batch(batch, fetcher, pool)
+        elapsed = time.perf_counter() - started
+        return {
+            **self.stats,
+            "seconds": round(elapsed, 3),
+            "queries_per_second": round(self.stats["queries"] / elapsed, 2) if elapsed else None,
+            "records_per_second": round(self.stats["fetched"] / elapsed, 1) if elapsed else None,
+        }
+
+
+def build_apis(args: argparse.Namespace) -> Dict[str, AbstractJobAPI]:
+    """
+    Создаёт клиентов API с общим планировщиком запросов и кэшем. Оба источника
+    ограничены args.rps запросами в секунду и args.fetch_workers одновременными запросами.
+    """
+    cache = None if args.no_cache else ResponseCache()
+    scheduler = RequestScheduler()
+    apis: Dict[str, AbstractJobAPI] = {
+        "hh": HeadHunterAPI(max_workers=args.fetch_workers, requests_per_second=args.rps,
+                            cache=cache, scheduler=scheduler),
+    }
+    try:
+        apis["sj"] = SuperJobAPI(cache=cache, scheduler=scheduler, requests_per_second=args.rps,
+                                 max_in_flight=args.fetch_workers)
+    except ValueError as e:
+        print(f"SuperJob пропущен: {e}")
+    return apis
+
+
+def harvest(args: argparse.Namespace) -> Dict[str, float]:
+    queries = load_queries(args.queries)
+    saver = open_store(args.store)
+    try:
+        harvester = BatchHarvester(saver, build_apis(args), fetch_workers=args.fetch_workers,
+                                   processes=args.processes, chunk_size=args.chunk_size,
+                                   batch_size=args.batch_size, max_results=args.max_results,
+                                   default_source=args.source)
+        return harvester.run(queries)
+    finally:
+        if hasattr(saver, "close"):
+            saver.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетный сбор вакансий по списку запросов.")
+    parser.add_argument("queries", help="Файл запросов (JSON-список или JSON Lines).")
+    parser.add_argument("--store", default="vacancies.json", help="Хранилище: .json, .jsonl или .db (SQLite).")
+    parser.add_argument("--source", choices=SOURCES + ("all",), default="hh", help="Источник по умолчанию.")
+    parser.add_argument("--max-results", type=int, default=500, help="Вакансий на запрос из одного источника.")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="Потоков загрузки.")
+    parser.add_argument("--processes", type=int, default=None, help="Процессов нормализации (по умолчанию — число ядер).")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Вакансий в одной задаче нормализации.")
+    parser.add_argument("--batch-size", type=int, default=50, help="Запросов на одну запись в хранилище.")
+    parser.add_argument("--rps", type=float, default=5.0, help="Запросов в секунду к каждому источнику.")
+    parser.add_argument("--no-cache", action="store_true", help="Не использовать кэш ответов.")
+    parser.add_argument("--metrics", help="Сохранить метрики запуска (.json или .prom).")
+    parser.add_argument("--profile", help="Профилировать запуск и сохранить отчёт в файл.")
+    args = parser.parse_args(argv)
+
+    summary = instrument_run(harvest, args.metrics, args.profile, args)
+    print("=" * 50)
+    print(f"Запросов: {summary['queries']}, загружено вакансий: {summary['fetched']}, "
+          f"отобрано: {summary['selected']}, записано: {summary['written']}, "
+          f"ошибок загрузки: {summary['fetch_failures']}")
+    print(f"Время: {summary['seconds']} с, {summary['queries_per_second']} запросов/с, "
+          f"{summary['records_per_second']} вакансий/с")
+    return 1 if summary["fetch_failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
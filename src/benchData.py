@@ -0,0 +1,128 @@
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from standInServer import Route
+
+# Словари для синтетических вакансий
+TITLES = [
+    "Python-разработчик", "Backend developer", "Frontend-разработчик", "Data Scientist",
+    "Аналитик данных", "DevOps-инженер", "QA-инженер", "Java developer", "Тестировщик",
+    "Системный администратор", "Product manager", "Go-разработчик", "ML engineer",
+]
+LEVELS = ["Junior", "Middle", "Senior", "Lead", "Стажёр", "Ведущий"]
+SKILLS = [
+    "Python", "Django", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Linux", "Git",
+    "SQL", "Redis", "Kafka", "React", "TypeScript", "Java", "Spring", "Go", "pandas",
+    "английский язык", "опыт работы", "высшее образование", "CI/CD", "REST API", "микросервисы",
+]
+PHRASES = [
+    "Опыт коммерческой разработки на {skill} от {years} лет.",
+    "Знание {skill} и {other}.",
+    "Уверенное владение <highlighttext>{skill}</highlighttext>.",
+    "Понимание принципов <b>{skill}</b> &amp; {other}.",
+    "Будет плюсом: опыт с {skill}.",
+]
+CITIES = ["Москва", "Санкт-Петербург", "Новосибирск", "Екатеринбург", "Казань", "Алматы", "Минск", "Удалённо"]
+EMPLOYERS = ["Яндекс", "Сбер", "Тинькофф", "VK", "Ozon", "Wildberries", "Авито", "Kaspersky",
+             "2ГИС", "СКБ Контур", "EPAM", "Positive Technologies"]
+CURRENCIES = ["RUR"] * 8 + ["USD", "EUR", "KZT"]
+BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _requirements(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        parts.append(rng.choice(PHRASES).format(skill=rng.choice(SKILLS), other=rng.choice(SKILLS),
+                                                years=rng.randint(1, 6)))
+    return " ".join(parts)
+
+
+def _salary(rng: random.Random, currency: str) -> Dict:
+    scale = {"RUR": 1, "KZT": 5.3}.get(currency, 0.011)
+    low = int(rng.randint(30, 400) * 1000 * scale)
+    kind = rng.random()
+    if kind < 0.15:
+        return {"from": None, "to": None}
+    if kind < 0.4:
+        return {"from": low, "to": None}
+    if kind < 0.55:
+        return {"from": None, "to": low}
+    return {"from": low, "to": int(low * rng.uniform(1.1, 1.8))}
+
+
+def generate_hh_items(count: int, seed: int = 0) -> List[dict]:
+    """Генерирует count вакансий в формате ответа hh.ru (items)."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        currency = rng.choice(CURRENCIES)
+        salary = _salary(rng, currency)
+        city = rng.choice(CITIES)
+        employer = rng.choice(EMPLOYERS)
+        published = BASE_TIME - timedelta(minutes=i)
+        items.append({
+            "id": str(10_000_000 + i),
+            "name": f"{rng.choice(LEVELS)} {rng.choice(TITLES)}",
+            "alternate_url": f"https://hh.ru/vacancy/{10_000_000 + i}",
+            "salary": None if salary["from"] is None and salary["to"] is None
+            else {**salary, "currency": currency, "gross": rng.random() < 0.5},
+            "snippet": {
+                "requirement": _requirements(rng) if rng.random() < 0.95 else None,
+                "responsibility": _requirements(rng),
+            },
+            "area": {"id": str(CITIES.index(city) + 1), "name": city},
+            "employer": {"id": str(EMPLOYERS.index(employer) + 1), "name": employer},
+            "published_at": published.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        })
+    return items
+
+
+def generate_sj_objects(count: int, seed: int = 0) -> List[dict]:
+    """Генерирует count вакансий в формате ответа SuperJob (objects)."""
+    rng = random.Random(seed + 1)
+    objects = []
+    for i in range(count):
+        salary = _salary(rng, "RUR")
+        city = rng.choice(CITIES)
+        objects.append({
+            "id": 50_000_000 + i,
+            "profession": f"{rng.choice(LEVELS)} {rng.choice(TITLES)}",
+            "link": f"https://www.superjob.ru/vakansii/{50_000_000 + i}.html",
+            "payment_from": salary["from"] or 0,
+            "payment_to": salary["to"] or 0,
+            "currency": "rub",
+            "town": {"id": CITIES.index(city) + 1, "title": city},
+            "firm_name": rng.choice(EMPLOYERS),
+            "work": _requirements(rng) if rng.random() < 0.9 else None,
+            "date_published": int((BASE_TIME - timedelta(minutes=i)).timestamp()),
+        })
+    return objects
+
+
+def hh_routes(items: List[dict]) -> Dict[str, Route]:
+    """Маршруты StandInServer, отдающие items постранично, как /vacancies hh.ru (page, per_page)."""
+    def vacancies(query: Dict[str, str]) -> dict:
+        per_page = int(query.get("per_page", 20))
+        page = int(query.get("page", 0))
+        return {
+            "items": items[page * per_page:(page + 1) * per_page],
+            "found": len(items),
+            "pages": math.ceil(len(items) / per_page),
+            "page": page,
+            "per_page": per_page,
+        }
+    return {"/vacancies": vacancies}
+
+
+def sj_routes(objects: List[dict]) -> Dict[str, Route]:
+    """Маршруты StandInServer, отдающие objects постранично, как /2.0/vacancies SuperJob (page, count)."""
+    def vacancies(query: Dict[str, str]) -> dict:
+        count = int(query.get("count", 20))
+        page = int(query.get("page", 0))
+        return {
+            "objects": objects[page * count:(page + 1) * count],
+            "total": len(objects),
+            "more": (page + 1) * count < len(objects),
+        }
+    return {"/2.0/vacancies": vacancies}
@@ -0,0 +1,200 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from benchData import generate_hh_items, generate_sj_objects, hh_routes, sj_routes
+from hhAPI import HeadHunterAPI
+from jsonSaver import JSONSaver
+from requestScheduler import RequestScheduler
+from sjAPI import SuperJobAPI
+from standInServer import StandInServer
+from vacancies import Vacancy
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+FILTER_WORDS = ["Python", "Москва", "SQL"]
+
+
+class Benchmark:
+    """
+    Класс Benchmark измеряет время каждого этапа обработки вакансий на синтетических данных:
+    половина записей в формате hh.ru, половина — SuperJob.
+
+    Этапы: fetch_hh и fetch_sj (клиенты API против локальных StandInServer),
+    vacancy_init, get_requirements, filter_vacancies, sort_vacancies,
+    add_vacancies (пакетная запись в пустой файл), add_vacancy (одна вакансия в заполненный файл),
+    save_to_file и load_from_file.
+    Загрузка по сети ограничена max_fetch записями на источник.
+
+    При memory=True пиковая память (tracemalloc) измеряется в отдельном повторном прогоне
+    тех же этапов, чтобы накладные расходы tracemalloc не попадали в замеры времени.
+    """
+    def __init__(self, latency: float = 0.0, per_page: int = 100, max_fetch: int = 100_000,
+                 workers: int = 4, memory: bool = False, seed: int = 0):
+        self.latency = latency
+        self.per_page = per_page
+        self.max_fetch = max_fetch
+        self.workers = workers
+        self.memory = memory
+        self.seed = seed
+        self.results: List[Dict] = []
+        self._tracing = False
+
+    def measure(self, stage: str, size: int, func: Callable[[], object]) -> object:
+        """
+        Выполняет этап и записывает его время, а в прогоне замера памяти —
+        пиковую память в уже записанный результат этапа.
+        """
+        gc.collect()
+        if self._tracing:
+            return self.measure_memory(stage, size, func)
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        self.results.append({
+            "stage": stage,
+            "size": size,
+            "output": len(result) if isinstance(result, list) else None,
+            "seconds": round(seconds, 6),
+            "records_per_second": round(size / seconds) if seconds else None,
+            "peak_bytes": None,
+        })
+        print(f"{stage:>18} {size:>9}: {seconds:9.3f} с")
+        return result
+
+    def measure_memory(self, stage: str, size: int, func: Callable[[], object]) -> object:
+        """Выполняет этап под tracemalloc и дописывает пиковую память в результат этапа."""
+        tracemalloc.start()
+        try:
+            result = func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        for entry in reversed(self.results):
+            if entry["stage"] == stage and entry["size"] == size:
+                entry["peak_bytes"] = peak
+                break
+        print(f"{stage:>18} {size:>9}: {peak / 2 ** 20:9.1f} МБ")
+        return result
+
+    def fetch_hh(self, items: List[dict]) -> List[dict]:
+        with StandInServer(hh_routes(items), latency=self.latency) as server:
+            api = HeadHunterAPI(max_workers=self.workers, scheduler=RequestScheduler())
+            api.API_BASE_URL = f"{server.url}/"
+            api.MAX_DEPTH = len(items)
+            return api.get_vacancies("python", per_page=self.per_page, max_results=len(items))
+
+    def fetch_sj(self, objects: List[dict]) -> List[dict]:
+        os.environ.setdefault("API_SUPERJOB", "benchmark")
+        with StandInServer(sj_routes(objects), latency=self.latency) as server:
+            api = SuperJobAPI(scheduler=RequestScheduler())
+            api.API_BASE_URL = f"{server.url}/2.0/"
+            return [item for page in api.iter_pages("python", count=self.per_page) for item in page]
+
+    def run_size(self, size: int) -> None:
+        hh_items = generate_hh_items(size // 2, self.seed)
+        sj_objects = generate_sj_objects(size - size // 2, self.seed)
+
+        fetch_count = min(self.max_fetch, len(hh_items))
+        self.measure("fetch_hh", fetch_count, lambda: self.fetch_hh(hh_items[:fetch_count]))
+        fetch_count = min(self.max_fetch, len(sj_objects))
+        self.measure("fetch_sj", fetch_count, lambda: self.fetch_sj(sj_objects[:fetch_count]))
+
+        raw = hh_items + sj_objects
+        del hh_items, sj_objects
+        vacancies = self.measure("vacancy_init", size, lambda: [Vacancy(**item) for item in raw])
+        del raw
+        self.measure("get_requirements", size, lambda: [v.get_requirements() for v in vacancies])
+
+        directory = tempfile.mkdtemp(prefix="vacancy-bench-")
+        try:
+            saver = JSONSaver(os.path.join(directory, "vacancies.json"))
+            self.measure("filter_vacancies", size, lambda: saver.filter_vacancies(vacancies, filter_words=FILTER_WORDS))
+            self.measure("sort_vacancies", size, lambda: saver.sort_vacancies(vacancies))
+
+            extra, vacancies = vacancies[-1], vacancies[:-1]
+            self.measure("add_vacancies", size - 1, lambda: saver.add_vacancies(vacancies))
+            self.measure("add_vacancy", 1, lambda: saver.add_vacancy(extra))
+            self.measure("save_to_file", size, saver.save_to_file)
+            del vacancies, saver
+            self.measure("load_from_file", size,
+                         lambda: JSONSaver(os.path.join(directory, "vacancies.json")).load_from_file())
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def run(self, sizes: List[int]) -> Dict:
+        """Прогоняет все этапы для каждого размера и возвращает отчёт."""
+        for size in sizes:
+            self.run_size(size)
+            if self.memory:
+                self._tracing = True
+                try:
+                    self.run_size(size)
+                finally:
+                    self._tracing = False
+        return self.report()
+
+    def report(self) -> Dict:
+        return {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "settings": {"latency": self.latency, "per_page": self.per_page, "max_fetch": self.max_fetch,
+                         "workers": self.workers, "memory": self.memory, "seed": self.seed},
+            "results": self.results,
+        }
+
+
+def compare(baseline: Dict, report: Dict, threshold: float = 1.2) -> List[str]:
+    """
+    Сравнивает отчёт с предыдущим: возвращает строки для этапов, которые стали медленнее
+    baseline больше чем в threshold раз.
+    """
+    previous = {(r["stage"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get((result["stage"], result["size"]))
+        if old and old["seconds"] and result["seconds"] / old["seconds"] > threshold:
+            regressions.append(f"{result['stage']} ({result['size']}): "
+                               f"{old['seconds']:.3f} с -> {result['seconds']:.3f} с")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк загрузки, обработки и сохранения вакансий.")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="Количество записей через запятую (по умолчанию %(default)s).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа сервера, с.")
+    parser.add_argument("--per-page", type=int, default=100, help="Вакансий на странице.")
+    parser.add_argument("--max-fetch", type=int, default=100_000, help="Максимум записей, загружаемых по сети.")
+    parser.add_argument("--workers", type=int, default=4, help="Потоков загрузки hh.ru.")
+    parser.add_argument("--memory", action="store_true",
+                        help="Измерить пиковую память этапов в отдельном прогоне (tracemalloc).")
+    parser.add_argument("--output", default="benchmark.json", help="Файл отчёта JSON.")
+    parser.add_argument("--baseline", help="Предыдущий отчёт для поиска регрессий.")
+    args = parser.parse_args(argv)
+
+    benchmark = Benchmark(latency=args.latency, per_page=args.per_page, max_fetch=args.max_fetch,
+                          workers=args.workers, memory=args.memory)
+    report = benchmark.run([int(size) for size in args.sizes.split(",")])
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"Отчёт сохранён в {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare(json.load(file), report)
+        for line in regressions:
+            print(f"Регрессия: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+from array import array
+import random
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from vacancies import Vacancy, NO_REQUIREMENTS, NOT_SPECIFIED
+from jsonSaver import JSONSaver, search_fields
+from keywordIndex import tokenize
+
+VacancyLike = Union[Dict, Vacancy]
+
+
+def exact_key(vacancy: VacancyLike) -> Optional[str]:
+    """
+    Точный ключ дубликата: нормализованные работодатель, название и город.
+    Если работодатель или город не указан, ключа нет (None): одинаковое название
+    без них не означает, что это одна и та же вакансия.
+    """
+    title, _, employer, city = search_fields(vacancy)
+    if employer in ("", NOT_SPECIFIED) or city in ("", NOT_SPECIFIED):
+        return None
+    return "|".join(" ".join(tokenize(text)) for text in (employer, title, city))
+
+
+def get_link(vacancy: VacancyLike) -> str:
+    return vacancy.link if isinstance(vacancy, Vacancy) else vacancy.get("link", "")
+
+
+def get_sources(vacancy: VacancyLike) -> List[str]:
+    """Ссылки на все известные копии вакансии."""
+    sources = vacancy.sources if isinstance(vacancy, Vacancy) else vacancy.get("sources")
+    return sources or [get_link(vacancy)]
+
+
+def add_source(canonical: VacancyLike, duplicate: VacancyLike) -> None:
+    """Добавляет ссылки дубликата к каноничной вакансии."""
+    sources = list(get_sources(canonical))
+    for link in get_sources(duplicate):
+        if link and link not in sources:
+            sources.append(link)
+    if isinstance(canonical, Vacancy):
+        canonical.sources = sources
+    else:
+        canonical["sources"] = sources
+
+
+class DuplicateDetector:
+    """
+    Класс DuplicateDetector находит копии вакансий, в том числе опубликованные на разных сайтах.
+
+    Сначала проверяется точный ключ (работодатель + название + город), если работодатель
+    и город указаны. Затем для текста
+    названия и требований строится MinHash-подпись по парам соседних слов, которая раскладывается
+    на полосы (LSH): кандидатами считаются только вакансии, совпавшие хотя бы в одной полосе,
+    и для них сравнивается оценка сходства Жаккара. Попарного сравнения всех вакансий нет,
+    поэтому детектор масштабируется на сотни тысяч записей.
+    Тексты короче min_tokens слов проверяются только по точному ключу.
+    """
+    def __init__(self, threshold: float = 0.7, num_perm: int = 32, bands: int = 8,
+                 min_tokens: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm должно делиться на bands.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_tokens = min_tokens
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(32) for _ in range(num_perm)]
+        self._exact: Dict[str, int] = {}
+        self._items: List[VacancyLike] = []
+        self._signatures: List[Optional[array]] = []
+        self._buckets: List[Dict[tuple, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def signature(self, vacancy: VacancyLike) -> Optional[array]:
+        """MinHash-подпись текста вакансии или None, если текст слишком короткий."""
+        title, requirements, _, _ = search_fields(vacancy)
+        if requirements == NO_REQUIREMENTS:
+            requirements = ""
+        tokens = tokenize(f"{title} {requirements}")
+        if len(tokens) < self.min_tokens:
+            return None
+        shingles = {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        return array("I", (min(map(mask.__xor__, hashes)) for mask in self._masks))
+
+    def similarity(self, first: array, second: array) -> float:
+        """Оценка сходства Жаккара по двум подписям."""
+        return sum(a == b for a, b in zip(first, second)) / self.num_perm
+
+    def find(self, vacancy: VacancyLike, signature: Optional[array] = None) -> Optional[VacancyLike]:
+        """Возвращает уже известную каноничную копию вакансии или None."""
+        key = exact_key(vacancy)
+        position = self._exact.get(key) if key is not None else None
+        if position is not None:
+            return self._items[position]
+        signature = signature if signature is not None else self.signature(vacancy)
+        if signature is None:
+            return None
+        checked = set()
+        for band, buckets in enumerate(self._buckets):
+            for position in buckets.get(self._band_key(signature, band), ()):
+                if position in checked:
+                    continue
+                checked.add(position)
+                if self.similarity(signature, self._signatures[position]) >= self.threshold:
+                    return self._items[position]
+        return None
+
+    def add(self, vacancy: VacancyLike) -> VacancyLike:
+        """
+        Регистрирует вакансию. Возвращает её каноничную копию: саму вакансию, если она новая,
+        или найденную ранее копию (к ней добавляется ссылка дубликата в sources).
+        """
+        signature = self.signature(vacancy)
+        canonical = self.find(vacancy, signature)
+        if canonical is not None:
+            add_source(canonical, vacancy)
+            return canonical
+
+        position = len(self._items)
+        self._items.append(vacancy)
+        self._signatures.append(signature)
+        key = exact_key(vacancy)
+        if key is not None:
+            self._exact.setdefault(key, position)
+        if signature is not None:
+            for band, buckets in enumerate(self._buckets):
+                buckets.setdefault(self._band_key(signature, band), []).append(position)
+        return vacancy
+
+    def _band_key(self, signature: array, band: int) -> tuple:
+        return tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+
+def deduplicate(detector: Optional[DuplicateDetector] = None):
+    """
+    Этап Pipeline: пропускает только первую копию каждой вакансии,
+    ссылки на последующие копии добавляются в её sources.
+    """
+    detector = detector or DuplicateDetector()
+
+    def stage(vacancies: Iterable[Vacancy]) -> Iterator[Vacancy]:
+        for vacancy in vacancies:
+            if detector.add(vacancy) is vacancy:
+                yield vacancy
+    return stage
+
+
+def deduplicate_store(saver: JSONSaver, detector: Optional[DuplicateDetector] = None) -> int:
+    """
+    Объединяет копии в сохранённых вакансиях: в каждой группе остаётся первая запись
+    со ссылками на все копии в "sources", остальные удаляются одной записью в файл.
+    Возвращает количество удалённых записей.
+    """
+    detector = detector or DuplicateDetector()
+    saver.load_from_file()
+    duplicates = [record for record in saver.vacancies if detector.add(record) is not record]
+    return saver.delete_vacancies(duplicates)
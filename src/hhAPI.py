@@ -1,38 +1,158 @@
-from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import math
+from urllib.parse import urlparse
 import requests
-from typing import List
-
-
-class AbstractJobAPI(ABC):
-    """
-    Абстрактный класс AbstractJobAPI определяет интерфейс для работы с API вакансий.
-    """
-    @abstractmethod
-    def get_vacancies(self, search_query: str) -> List[dict]:
-        """
-        Получает список вакансий по запросу.
-        """
-        pass
+from requests.adapters import HTTPAdapter
+from typing import Iterator, List, Optional
+from jobAPI import AbstractJobAPI
+from httpCache import ResponseCache
+from instrumentation import metrics
+from requestScheduler import RequestScheduler
+from vacancies import parse_published_at
 
 
 class HeadHunterAPI(AbstractJobAPI):
     """
     Класс HeadHunterAPI реализует интерфейс AbstractJobAPI для взаимодействия с API HeadHunter.
+
+    Запросы идут через одну keep-alive сессию. Если указан per_page, max_pages или max_results,
+    вакансии собираются постранично: первая страница сообщает количество страниц,
+    остальные загружаются параллельно в пуле потоков и возвращаются в порядке страниц
+    (iter_pages отдаёт их по одной, не дожидаясь остальных).
+    Если передан cache, ответы берутся из него и хранятся CACHE_TTL секунд.
+    Запросы отправляются через scheduler (RequestScheduler, можно передать общий): если хост hh.ru
+    в нём ещё не настроен, задаётся лимит requests_per_second и max_workers одновременных запросов.
+    Если после всех повторов запрос не удался, выбрасывается requests.exceptions.RequestException.
     """
     API_BASE_URL = "https://api.hh.ru/"
+    MAX_PER_PAGE = 100
+    MAX_DEPTH = 2000  # API hh.ru отдаёт не больше 2000 вакансий на один запрос
+    CACHE_TTL = 600
+
+    def __init__(self, max_workers: int = 4, requests_per_second: Optional[float] = 5.0,
+                 session: Optional[requests.Session] = None, cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None):
+        self.max_workers = max_workers
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self.scheduler.configure_host(urlparse(self.API_BASE_URL).netloc, requests_per_second, max_workers,
+                                      replace=False)
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    def get_vacancies(self, search_query: str) -> List[dict]:
+    def get_vacancies(
+        self,
+        search_query: str,
+        per_page: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_results: Optional[int] = None,
+        **kwargs
+    ) -> List[dict]:
         """
         Получает список вакансий по запросу.
+        Без параметров пагинации возвращает только первую страницу результатов.
         """
-        endpoint = "vacancies"
-        params = {"text": search_query}
+        return [item for page in self.iter_pages(search_query, per_page, max_pages, max_results, **kwargs)
+                for item in page]
+
+    def iter_pages(
+        self,
+        search_query: str,
+        per_page: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_results: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[List[dict]]:
+        """
+        Отдаёт вакансии постранично, в порядке страниц, по мере загрузки.
+        Одновременно загружается не больше 2 * max_workers страниц.
+        Если страницу не удалось загрузить, выбрасывается requests.exceptions.RequestException,
+        уже отданные страницы остаются у вызывающего кода.
+        """
+        params = {"text": search_query, **kwargs}
+        paginated = per_page is not None or max_pages is not None or max_results is not None
+        if paginated:
+            if per_page is None:
+                per_page = min(self.MAX_PER_PAGE, max_results) if max_results else self.MAX_PER_PAGE
+            per_page = max(1, min(per_page, self.MAX_PER_PAGE))
+            params["per_page"] = per_page
 
+        first_page = self._fetch_page(params, 0 if paginated else None)
+        if not paginated:
+            yield first_page.get("items", [])
+            return
+
+        pages = first_page.get("pages", 1)
+        pages = min(pages, self.MAX_DEPTH // per_page)
+        if max_pages is not None:
+            pages = min(pages, max_pages)
+        if max_results is not None:
+            pages = min(pages, math.ceil(max_results / per_page))
+
+        remaining = max_results if max_results is not None else pages * per_page
+        items = first_page.get("items", [])[:remaining]
+        remaining -= len(items)
+        yield items
+
+        if pages <= 1 or remaining <= 0:
+            return
+        window = 2 * self.max_workers
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = deque()
+        next_page = 1
         try:
-            response = requests.get(f"{self.API_BASE_URL}{endpoint}", params=params)
-            response.raise_for_status()
-            vacancies = response.json().get("items", [])
-            return vacancies
-        except requests.exceptions.RequestException as e:
-            print(f"Error accessing HeadHunter API: {e}")
-            return []
\ No newline at end of file
+            while next_page < pages and len(pending) < window:
+                pending.append(executor.submit(self._fetch_page_items, params, next_page))
+                next_page += 1
+            while pending and remaining > 0:
+                items = pending.popleft().result()
+                if next_page < pages:
+                    pending.append(executor.submit(self._fetch_page_items, params, next_page))
+                    next_page += 1
+                items = items[:remaining]
+                remaining -= len(items)
+                yield items
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_page(self, params: dict, page: Optional[int] = None) -> dict:
+        """Загружает одну страницу результатов поиска."""
+        endpoint = "vacancies"
+        url = f"{self.API_BASE_URL}{endpoint}"
+        if page is not None:
+            params = {**params, "page": page}
+
+        def send(extra_headers: Optional[dict] = None) -> requests.Response:
+            return self.scheduler.get(self.session, url, params=params, headers=extra_headers)
+
+        with metrics.span("hh.fetch_page"):
+            if self.cache is not None:
+                data = self.cache.fetch(url, params, send, ttl=self.CACHE_TTL)
+            else:
+                response = send()
+                response.raise_for_status()
+                data = response.json()
+        metrics.count("hh.records_in", len(data.get("items", [])))
+        return data
+
+    def _fetch_page_items(self, params: dict, page: int) -> List[dict]:
+        """
+        Загружает вакансии одной страницы. Ошибка не заменяется пустой страницей,
+        а передаётся вызывающему коду, чтобы в результатах не было незаметных пропусков.
+        """
+        return self._fetch_page(params, page).get("items", [])
+
+    def sync_params(self, since: Optional[float]) -> dict:
+        """Параметры запроса новых вакансий: сортировка по дате публикации и date_from."""
+        params = {"order_by": "publication_time"}
+        if since is not None:
+            params["date_from"] = datetime.fromtimestamp(since, tz=timezone.utc).isoformat(timespec="seconds")
+        return params
+
+    def published_at(self, vacancy: dict) -> Optional[float]:
+        """Возвращает время публикации вакансии hh.ru (unix-время) или None."""
+        return parse_published_at(vacancy)
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+import requests
+from instrumentation import metrics
+
+
+class ResponseCache:
+    """
+    Класс ResponseCache хранит ответы API вакансий на диске.
+
+    Ключ записи строится по адресу запроса и нормализованным параметрам
+    (пустые параметры отбрасываются, порядок не важен). Свежая запись возвращается
+    без обращения к сети. Устаревшая запись проверяется условным запросом
+    (If-None-Match / If-Modified-Since), если API прислал ETag или Last-Modified.
+    При превышении max_entries или max_bytes удаляются давно не использованные записи.
+
+    Методы:
+    - fetch(url, params, send, ttl): Возвращает данные ответа из кэша или из сети.
+    - stats(): Возвращает счётчики попаданий и промахов.
+    - clear(): Удаляет все записи кэша.
+    """
+    def __init__(self, cache_dir: str = ".http_cache", ttl: float = 600.0,
+                 max_entries: int = 1000, max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # ключ -> размер файла, в порядке использования
+        self._total_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stale": 0, "evictions": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_entries()
+
+    def _load_entries(self) -> None:
+        """Восстанавливает список записей и порядок их использования по файлам на диске."""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                files.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(url: str, params: Optional[dict] = None) -> str:
+        """Строит ключ записи по адресу и нормализованным параметрам запроса."""
+        normalized = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None and v != "")
+        raw = json.dumps([url, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[dict]:
+        """Читает запись кэша, повреждённая запись считается отсутствующей."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, entry: dict) -> None:
+        """Атомарно записывает запись кэша и удаляет лишние записи."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(entry, file, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+        size = os.path.getsize(self._path(key))
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def _touch(self, key: str) -> None:
+        """Отмечает запись как недавно использованную."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Удаляет самые давно использованные записи сверх лимитов (вызывается под блокировкой)."""
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+        metrics.count(f"cache.{name}")
+
+    def fetch(self, url: str, params: Optional[dict], send: Callable[[Dict[str, str]], requests.Response],
+              ttl: Optional[float] = None) -> dict:
+        """
+        Возвращает разобранный JSON ответа.
+
+        send принимает дополнительные заголовки условного запроса и выполняет сам запрос.
+        Если сеть недоступна, а в кэше есть устаревшая запись, возвращается она.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        key = self.make_key(url, params)
+        entry = self._read(key)
+
+        if entry is not None and time.time() - entry["stored_at"] < ttl:
+            self._count("hits")
+            self._touch(key)
+            return entry["data"]
+
+        conditional_headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                conditional_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = send(conditional_headers)
+            if response.status_code == 304 and entry is not None:
+                self._count("revalidated")
+                entry["stored_at"] = time.time()
+                self._write(key, entry)
+                return entry["data"]
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException:
+            if entry is None:
+                raise
+            self._count("stale")
+            return entry["data"]
+
+        self._count("misses")
+        self._write(key, {
+            "url": url,
+            "params": params,
+            "stored_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "data": data,
+        })
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счётчики работы кэша и его текущий размер."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._total_bytes}
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
@@ -0,0 +1,202 @@
+import cProfile
+from contextlib import contextmanager, nullcontext
+import io
+import json
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, Optional
+
+# Общий пустой контекст: выключенный span не создаёт объектов
+NULL_SPAN = nullcontext()
+
+
+class Span:
+    """Замеряет время выполнения блока и добавляет его в таймер Metrics."""
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+
+class Metrics:
+    """
+    Класс Metrics собирает таймеры этапов (span) и счётчики (count) одного запуска.
+
+    По умолчанию сбор выключен: span возвращает общий пустой контекст, count сразу выходит,
+    поэтому вызовы в горячих местах почти ничего не стоят. Вызывающий код в циклах
+    может дополнительно проверять metrics.enabled.
+
+    Методы:
+    - enable(), disable(), reset(): Управляют сбором.
+    - span(name): Контекстный менеджер, замеряющий время этапа.
+    - count(name, value): Увеличивает счётчик.
+    - summary(): Возвращает счётчики и таймеры словарём.
+    - merge(summary): Добавляет сводку другого процесса.
+    - to_json(path), to_prometheus(path): Сохраняют сводку в JSON или текстовом формате Prometheus.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.counters: Dict[str, float] = {}
+        self.timers: Dict[str, list] = {}  # имя -> [количество, сумма, максимум]
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+            self.started_at = time.time()
+
+    def span(self, name: str):
+        """Замеряет время блока with под именем name."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Добавляет измерение времени в таймер name."""
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def merge(self, summary: Dict) -> None:
+        """Добавляет счётчики и таймеры сводки summary() другого процесса (например, из пула)."""
+        with self._lock:
+            for name, value in summary["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, timer in summary["timers"].items():
+                current = self.timers.get(name)
+                if current is None:
+                    self.timers[name] = [timer["count"], timer["total"], timer["max"]]
+                else:
+                    current[0] += timer["count"]
+                    current[1] += timer["total"]
+                    current[2] = max(current[2], timer["max"])
+
+    def count(self, name: str, value: float = 1) -> None:
+        """Увеличивает счётчик name на value."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration": time.time() - self.started_at,
+                "counters": dict(self.counters),
+                "timers": {
+                    name: {"count": count, "total": total, "max": maximum, "mean": total / count}
+                    for name, (count, total, maximum) in self.timers.items()
+                },
+            }
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def metric_name(name: str) -> str:
+        """Имя метрики Prometheus: только латиница, цифры и подчёркивания."""
+        return "vacancy_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+    def to_prometheus(self, path: Optional[str] = None) -> str:
+        """Возвращает сводку в текстовом формате Prometheus и при указании path сохраняет её в файл."""
+        summary = self.summary()
+        lines = []
+        for name, value in sorted(summary["counters"].items()):
+            metric = self.metric_name(name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        if summary["timers"]:
+            lines.append("# TYPE vacancy_stage_seconds summary")
+            for name, timer in sorted(summary["timers"].items()):
+                lines.append(f'vacancy_stage_seconds_sum{{stage="{name}"}} {timer["total"]:.6f}')
+                lines.append(f'vacancy_stage_seconds_count{{stage="{name}"}} {timer["count"]}')
+        text = "\n".join(lines) + "\n"
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text)
+        return text
+
+    def export(self, path: str) -> None:
+        """Сохраняет сводку: файлы .prom — в формате Prometheus, остальные — в JSON."""
+        if path.endswith(".prom"):
+            self.to_prometheus(path)
+        else:
+            self.to_json(path)
+
+
+# Метрики процесса, общие для клиентов API, Vacancy и хранилищ
+metrics = Metrics()
+
+
+@contextmanager
+def profile(path: Optional[str] = None, top: int = 25) -> Iterator[None]:
+    """
+    Выполняет блок под cProfile и tracemalloc и выводит (или сохраняет в path)
+    top самых затратных функций по суммарному времени и строк по выделенной памяти.
+    """
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        report = io.StringIO()
+        report.write("=== Время (cProfile, по суммарному времени) ===\n")
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(top)
+        report.write("=== Память (tracemalloc, по строкам) ===\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            report.write(f"{stat}\n")
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(report.getvalue())
+            profiler.dump_stats(f"{path}.pstats")
+        else:
+            print(report.getvalue())
+
+
+def instrument_run(func: Callable, metrics_path: Optional[str] = None, profile_path: Optional[str] = None,
+                   *args, **kwargs):
+    """
+    Выполняет func со сбором метрик (если указан metrics_path) и под профилировщиком
+    (если указан profile_path). Метрики сохраняются даже при ошибке.
+    """
+    if metrics_path:
+        metrics.reset()
+        metrics.enable()
+    try:
+        with profile(profile_path) if profile_path else NULL_SPAN:
+            return func(*args, **kwargs)
+    finally:
+        if metrics_path:
+            metrics.disable()
+            metrics.export(metrics_path)
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+
+
+class AbstractJobAPI(ABC):
+    """
+    Абстрактный класс AbstractJobAPI определяет интерфейс для работы с API вакансий.
+    Общий для всех источников вакансий (hh.ru, SuperJob и др.).
+    """
+    @abstractmethod
+    def get_vacancies(self, search_query: str, **params) -> List[dict]:
+        """
+        Получает список вакансий по запросу.
+        """
+        pass
+
+    def iter_pages(self, search_query: str, **params) -> Iterator[List[dict]]:
+        """
+        Отдаёт вакансии постранично по мере загрузки.
+        По умолчанию весь результат get_vacancies считается одной страницей.
+        """
+        yield self.get_vacancies(search_query, **params)
+
+    def sync_params(self, since: Optional[float]) -> dict:
+        """
+        Параметры запроса для инкрементальной синхронизации: только вакансии,
+        опубликованные не раньше since (unix-время), от новых к старым.
+        """
+        return {}
+
+    def published_at(self, vacancy: dict) -> Optional[float]:
+        """Возвращает время публикации вакансии (unix-время) или None."""
+        return None
@@ -1,22 +1,45 @@
 from vacancies import Vacancy
+from keywordIndex import KeywordIndex, tokenize
+from instrumentation import metrics
 from abc import abstractmethod, ABC
+import bisect
+import heapq
 import json
-from typing import List, Dict, Union
+from contextlib import contextmanager
+from typing import List, Dict, Union, Iterable, Iterator, Optional, Set, Tuple
 import os
+import tempfile
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировки между процессами недоступны
+    fcntl = None
 
 
 class AbstractVacancySaver(ABC):
     """
     Абстрактный класс AbstractVacancySaver определяет интерфейс для сохранения вакансий.
+    Фильтрация, сортировка и вывод списков вакансий не зависят от способа хранения
+    и реализованы здесь; хранилища могут выполнять их запросами к своим индексам.
     """
     @abstractmethod
     def add_vacancy(self, vacancy: Vacancy) -> None:
         """Добавляет вакансию в хранилище."""
         pass
 
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> int:
+        """Добавляет несколько вакансий в хранилище и возвращает количество добавленных."""
+        added = 0
+        for vacancy in vacancies:
+            self.add_vacancy(vacancy)
+            added += 1
+        return added
+
     @abstractmethod
-    def get_vacancies_by_salary(self, min_salary: float) -> List[Vacancy]:
-        """Возвращает вакансии с зарплатой не ниже указанной."""
+    def get_vacancies_by_salary(self, min_salary: float, max_salary: Optional[float] = None) -> List[Vacancy]:
+        """Возвращает вакансии с зарплатой не ниже min_salary (и не выше max_salary, если задана)."""
         pass
 
     @abstractmethod
@@ -24,132 +47,496 @@ class AbstractVacancySaver(ABC):
         """Удаляет вакансию из хранилища."""
         pass
 
-    @abstractmethod
     def filter_vacancies(self, *vacancies: List[Dict[str, str]], filter_words: List[str]) -> List[Dict[str, str]]:
-        """Фильтрует вакансии по ключевым словам."""
-        pass
+        """
+        Фильтрует вакансии по ключевым словам: остаются вакансии, в названии, требованиях,
+        работодателе или городе которых есть хотя бы одно из слов (фраз).
+        """
+        with metrics.span("filter"):
+            phrases = keyword_phrases(filter_words)
+            candidates = [v for vacancy in vacancies for v in vacancy]
+            result = [vacancy for vacancy in candidates if matches_phrases(vacancy, phrases)]
+        metrics.count("filter.records_in", len(candidates))
+        metrics.count("filter.records_out", len(result))
+        return result
+
+    def word_match(self, vacancy: Union[Vacancy, Dict[str, str]], filter_words: List[str]) -> bool:
+        """Проверяет, соответствует ли вакансия ключевым словам."""
+        return matches_phrases(vacancy, keyword_phrases(filter_words))
 
-    @abstractmethod
     def sort_vacancies(self, vacancies: List[Union[Dict[str, str], Vacancy]]) -> List[Union[Dict[str, str], Vacancy]]:
-        """Сортирует вакансии по заработной плате."""
-        pass
+        """Сортирует вакансии по заработной плате в рублях, от большей к меньшей."""
+        return sorted(vacancies, key=salary_key, reverse=True)
 
-    @abstractmethod
     def get_top_vacancies(self, vacancies: List[Union[Dict[str, str], Vacancy]], top_n: int) -> List[Union[Dict[str, str], Vacancy]]:
-        """Возвращает топ N вакансий."""
-        pass
+        """Возвращает топ N вакансий по заработной плате в рублях, от большей к меньшей."""
+        return heapq.nlargest(top_n, vacancies, key=salary_key)
 
-    @abstractmethod
     def print_vacancies(self, vacancies: List[Union[Dict[str, str], Vacancy]]) -> None:
         """Выводит информацию о вакансиях."""
-        pass
+        for vacancy in vacancies:
+            if isinstance(vacancy, Vacancy):
+                print(f"Название: {vacancy.title}")
+                print(f"Ссылка: {vacancy.link}")
+                print(f"Зарплата: {vacancy.extract_salary()}")
+                print(f"Требования: {vacancy.get_requirements()}")
+                print(f"Город: {vacancy.get_city()}")
+                print(f"Валюта: {vacancy.get_currency()}")
+                print(f"Работодатель: {vacancy.get_employer()}")
+                print("=" * 50)  # Добавим строку-разделитель
+            elif isinstance(vacancy, dict):
+                print(f"Название: {vacancy.get('title', 'Не указано')}")
+                print(f"Ссылка: {vacancy.get('link', 'Не указана')}")
+                print(f"Зарплата: {vacancy.get('salary', 'Не указана')}")
+                print(
+                    f"Требования: {vacancy.get('requirements', 'данные отсутствуют, проверьте информацию о требованиях в вакансии по ссылке')}")
+                print(f"Город: {vacancy.get('city', 'Не указан')}")
+                print(f"Валюта: {vacancy.get('currency', 'Не указана')}")
+                print(f"Работодатель: {vacancy.get('employer', 'Не указан')}")
+                print("=" * 50)  # Добавим строку-разделитель
+
+
+def to_record(vacancy: Vacancy) -> Dict:
+    """Преобразует объект Vacancy в запись для сохранения (общий формат всех хранилищ)."""
+    record = {
+        "id": vacancy.id,
+        "title": vacancy.title,
+        "link": vacancy.link,
+        "salary": vacancy.extract_salary(),
+        "salary_from": vacancy.salary.get("from"),
+        "salary_to": vacancy.salary.get("to"),
+        "salary_rub": vacancy.get_salary_rub()["mid"],
+        "requirements": vacancy.get_requirements(),
+        "city": vacancy.get_city(),
+        "currency": vacancy.get_currency(),
+        "employer": vacancy.get_employer(),
+        "published_at": vacancy.published_at,
+    }
+    if vacancy.sources:
+        record["sources"] = vacancy.sources
+    return record
+
+
+def salary_key(vacancy: Union[Dict, Vacancy]) -> int:
+    """
+    Возвращает середину зарплатной вилки в рублях для сортировки.
+    Вакансии без зарплаты получают -1 и оказываются в конце.
+    """
+    if isinstance(vacancy, Vacancy):
+        salary = vacancy.get_salary_rub()["mid"]
+    elif "salary_rub" in vacancy:
+        salary = vacancy["salary_rub"]
+    else:
+        salary = Vacancy(**vacancy).get_salary_rub()["mid"]
+    return salary if salary is not None else -1
+
+
+def search_fields(vacancy: Union[Dict, Vacancy]) -> List[str]:
+    """Возвращает поля вакансии, по которым выполняется поиск: название, требования, работодатель, город."""
+    if isinstance(vacancy, dict):
+        if "requirements" in vacancy:
+            return [str(vacancy.get(field) or "") for field in ("title", "requirements", "employer", "city")]
+        vacancy = Vacancy(**vacancy)
+    return [vacancy.title, vacancy.get_requirements(), vacancy.get_employer(), vacancy.get_city()]
+
+
+def keyword_phrases(filter_words: Iterable[str]) -> List[Set[str]]:
+    """Нормализует ключевые слова (фразы) в множества слов для matches_phrases."""
+    return [set(tokens) for tokens in (tokenize(word) for word in filter_words) if tokens]
+
+
+def matches_phrases(vacancy: Union[Dict, Vacancy], phrases: List[Set[str]]) -> bool:
+    """Проверяет, что в полях поиска вакансии есть все слова хотя бы одной из фраз."""
+    tokens = set()
+    for text in search_fields(vacancy):
+        tokens.update(tokenize(text))
+    return any(phrase <= tokens for phrase in phrases)
+
+
+class SalaryIndex:
+    """
+    Класс SalaryIndex хранит записи вакансий, упорядоченные по зарплате в рублях,
+    и отвечает на запросы по диапазону зарплат за O(log n + k).
+    Записи без зарплаты в индекс не попадают.
+    """
+    def __init__(self, records: Iterable[Dict] = ()):
+        pairs = sorted(((r["salary_rub"], r) for r in records if r.get("salary_rub") is not None),
+                       key=lambda pair: pair[0])
+        self._keys = [key for key, _ in pairs]
+        self._records = [record for _, record in pairs]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, record: Dict) -> None:
+        """Добавляет запись в индекс."""
+        key = record.get("salary_rub")
+        if key is None:
+            return
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._records.insert(position, record)
+
+    def remove(self, record: Dict) -> None:
+        """Удаляет запись из индекса."""
+        key = record.get("salary_rub")
+        if key is None:
+            return
+        start = bisect.bisect_left(self._keys, key)
+        end = bisect.bisect_right(self._keys, key)
+        for position in range(start, end):
+            if self._records[position] is record:
+                del self._keys[position]
+                del self._records[position]
+                return
+
+    def range(self, min_salary: Optional[float] = None, max_salary: Optional[float] = None) -> List[Dict]:
+        """Возвращает записи с зарплатой в диапазоне [min_salary, max_salary], от большей к меньшей."""
+        start = bisect.bisect_left(self._keys, min_salary) if min_salary is not None else 0
+        end = bisect.bisect_right(self._keys, max_salary) if max_salary is not None else len(self._keys)
+        return self._records[start:end][::-1]
+
 
 class JSONSaver(AbstractVacancySaver):
     """
     Класс JSONSaver реализует интерфейс AbstractVacancySaver для сохранения вакансий в JSON-файле.
 
+    Вакансии загружаются из файла один раз и индексируются по паре (название, ссылка)
+    и по id, поэтому добавление не требует повторного чтения и пересортировки файла.
+    Инвертированный индекс слов хранится рядом с файлом (<файл>.index) и обновляется
+    при добавлении и удалении вакансий.
+
+    Запись безопасна для нескольких процессов и сбоев: изменения выполняются под
+    блокировкой файла <файл>.lock (fcntl), перед изменением и чтением хранилище перечитывается,
+    если его изменил другой процесс, а файл записывается через временный файл с fsync
+    и атомарным переименованием. Добавляемые пакеты сначала кладутся в очередь <файл>.queue/,
+    и процесс, получивший блокировку, записывает все накопившиеся пакеты одной записью.
+
     Методы:
     - add_vacancy(vacancy): Добавляет вакансию в хранилище.
-    - get_vacancies_by_salary(min_salary): Возвращает вакансии с зарплатой не ниже указанной.
+    - add_vacancies(vacancies): Добавляет пакет вакансий с одной записью в файл.
+    - add_records(records): Добавляет пакет готовых записей с одной записью в файл.
+    - get_vacancies_by_salary(min_salary, max_salary): Возвращает вакансии из диапазона зарплат.
     - delete_vacancy(vacancy): Удаляет вакансию из хранилища.
+    - delete_vacancies(vacancies): Удаляет несколько вакансий одной записью в файл.
     - filter_vacancies(*vacancies, filter_words): Фильтрует вакансии по ключевым словам.
-    - sort_vacancies(vacancies): Сортирует вакансии по алфавиту названия.
-    - get_top_vacancies(vacancies, top_n): Возвращает топ N вакансий.
+    - search_vacancies(query): Ищет сохранённые вакансии запросом с AND/OR/NOT.
+    - sort_vacancies(vacancies): Сортирует вакансии по зарплате в рублях.
+    - get_top_vacancies(vacancies, top_n): Возвращает топ N вакансий по зарплате в рублях.
     - print_vacancies(vacancies): Выводит информацию о вакансиях.
     """
+    RESULT_TTL = 24 * 3600  # сколько хранить незабранные итоги пакетов, с
+
     def __init__(self, file_path="vacancies.json"):
         self.file_path = file_path
         self.vacancies = []
+        self._key_index: Dict[Tuple[str, str], Dict] = {}
+        self._id_index: Dict[str, Dict] = {}
+        self._salary_index = SalaryIndex()
+        self.keyword_index = KeywordIndex()
+        self._loaded = False
+        self._file_stat = None
+        self._lock_depth = 0
+        self._lock_file = None
+
+    @property
+    def index_path(self) -> str:
+        """Путь к файлу инвертированного индекса слов."""
+        return f"{self.file_path}.index"
+
+    @property
+    def lock_path(self) -> str:
+        """Путь к файлу блокировки."""
+        return f"{self.file_path}.lock"
+
+    @property
+    def queue_path(self) -> str:
+        """Каталог очереди пакетов, ожидающих записи."""
+        return f"{self.file_path}.queue"
 
     def load_from_file(self):
-        """Загружает данные из файла в список вакансий."""
+        """
+        Загружает данные из файла в список вакансий.
+        Повреждённый файл не считается пустым: выбрасывается ValueError, чтобы не затереть данные.
+        """
+        self._file_stat = self._stat()
         if os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                self.vacancies = json.load(file)
+            with open(self.file_path, 'r', encoding='utf-8') as file, metrics.span("json.load"):
+                try:
+                    self.vacancies = json.load(file)
+                except ValueError as e:
+                    raise ValueError(f"Файл {self.file_path} повреждён: {e}") from e
+            metrics.count("json.rows_loaded", len(self.vacancies))
         else:
             print("Файл с данными пуст или отсутствует.")
             self.vacancies = []
+        self._rebuild_index()
+        self._loaded = True
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        """Признаки версии файла на диске: inode, размер и время изменения."""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _refresh(self) -> None:
+        """Перечитывает файл, если с момента загрузки его изменил другой процесс."""
+        if not self._loaded or self._stat() != self._file_stat:
+            self.load_from_file()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Блокировка хранилища между процессами (повторный вход в одном объекте разрешён)."""
+        if self._lock_depth == 0:
+            self._lock_file = open(self.lock_path, "a")
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
+
+    def _rebuild_index(self) -> None:
+        """Перестраивает индексы по паре (название, ссылка), по id и по зарплате."""
+        self._key_index = {}
+        self._id_index = {}
+        for record in self.vacancies:
+            if "salary_rub" not in record:
+                # Запись сохранена до появления числовой зарплаты: границы берутся из строки "от X до Y"
+                vacancy = Vacancy(**record)
+                record.setdefault("salary_from", vacancy.salary["from"])
+                record.setdefault("salary_to", vacancy.salary["to"])
+                record["salary_rub"] = vacancy.get_salary_rub()["mid"]
+            self._index_record(record)
+        self._salary_index = SalaryIndex(self.vacancies)
+        self._load_keyword_index()
+
+    def _load_keyword_index(self) -> None:
+        """Загружает индекс слов с диска или строит его заново, если он устарел."""
+        if os.path.exists(self.index_path):
+            try:
+                index = KeywordIndex.load(self.index_path)
+                if set(index.documents) == {self._doc_id(r) for r in self.vacancies}:
+                    self.keyword_index = index
+                    return
+            except (OSError, ValueError):
+                pass
+        self.keyword_index = KeywordIndex()
+        for record in self.vacancies:
+            self.keyword_index.add(self._doc_id(record), search_fields(record))
+
+    @staticmethod
+    def _doc_id(record: Dict) -> str:
+        """Идентификатор записи в индексе слов."""
+        return json.dumps([record.get("title"), record.get("link")], ensure_ascii=False)
+
+    def _index_record(self, record: Dict) -> None:
+        """Добавляет запись в индексы по ключу и по id."""
+        self._key_index[(record.get("title"), record.get("link"))] = record
+        if record.get("id") is not None:
+            self._id_index[str(record["id"])] = record
+
+    def _unindex_record(self, record: Dict) -> None:
+        """Удаляет запись из индексов."""
+        self._key_index.pop((record.get("title"), record.get("link")), None)
+        if record.get("id") is not None:
+            self._id_index.pop(str(record["id"]), None)
+        self._salary_index.remove(record)
+        self.keyword_index.remove(self._doc_id(record))
+
+    def contains(self, title: str, link: str) -> bool:
+        """Проверяет, есть ли вакансия с таким названием и ссылкой в хранилище."""
+        self._refresh()
+        return (title, link) in self._key_index
+
+    def get_vacancy_by_id(self, vacancy_id) -> Optional[Dict]:
+        """Возвращает сохранённую вакансию по id или None."""
+        self._refresh()
+        return self._id_index.get(str(vacancy_id))
 
     def add_vacancy(self, vacancy: Vacancy) -> None:
         """Добавляет вакансию в хранилище."""
-        self.load_from_file()
-        existing_titles_and_links = [(v.get("title"), v.get("link")) for v in self.vacancies]
-        if (vacancy.title, vacancy.link) not in existing_titles_and_links:
-            self.vacancies.append({
-                "title": vacancy.title,
-                "link": vacancy.link,
-                "salary": vacancy.extract_salary(),
-                "requirements": vacancy.get_requirements(),
-                "city": vacancy.get_city(),
-                "currency": vacancy.get_currency(),
-                "employer": vacancy.get_employer(),
-            })
-            self.vacancies.sort(key=lambda x: x['title'])  # Сортировка по алфавиту названия
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> int:
+        """
+        Добавляет пакет вакансий в хранилище.
+        Новые записи сливаются с уже отсортированным списком, файл записывается один раз
+        (вместе с пакетами других процессов, ожидающими в очереди).
+        Возвращает количество добавленных вакансий.
+        """
+        return self.add_records(to_record(vacancy) for vacancy in vacancies)
+
+    def add_records(self, records: Iterable[Dict]) -> int:
+        """
+        Добавляет готовые записи (формат to_record) одной записью в файл, пропуская уже сохранённые.
+        Дубликаты проверяются под блокировкой по перечитанному хранилищу, поэтому учитываются
+        изменения других процессов. Возвращает количество добавленных записей.
+        """
+        records = list(records)
+        metrics.count("saver.records_in", len(records))
+        if not records:
+            return 0
+        name = self._enqueue(records)
+        with self._locked():
+            self._refresh()
+            self._commit_queue()
+            added, duplicates = self._take_result(name)
+        for title, link in duplicates:
+            print(f"Вакансия '{title}' по ссылке {link} уже существует.")
+        metrics.count("saver.rows_added", added)
+        return added
+
+    def _enqueue(self, records: List[Dict]) -> str:
+        """Кладёт пакет записей в очередь на диске (атомарно, через временный файл) и возвращает имя пакета."""
+        os.makedirs(self.queue_path, exist_ok=True)
+        name = f"{time.time_ns()}-{os.getpid()}-{uuid.uuid4().hex}"
+        tmp_path = os.path.join(self.queue_path, f"{name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(records, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, os.path.join(self.queue_path, f"{name}.json"))
+        return name
+
+    def _commit_queue(self) -> None:
+        """
+        Записывает все пакеты из очереди одной записью в файл (вызывается под блокировкой).
+        Пакеты удаляются из очереди только после записи, поэтому при сбое они будут
+        записаны повторно, а уже сохранённые записи отбросятся как дубликаты.
+        Итог каждого пакета (сколько добавлено, какие записи уже были) сохраняется
+        в <пакет>.done для процесса, который его поставил в очередь.
+        """
+        if not os.path.isdir(self.queue_path):
+            return
+        batch_names = sorted(name[:-len(".json")] for name in os.listdir(self.queue_path) if name.endswith(".json"))
+        new_records = []
+        results = {}
+        for name in batch_names:
+            with open(os.path.join(self.queue_path, f"{name}.json"), "r", encoding="utf-8") as file:
+                batch = json.load(file)
+            added, duplicates = 0, []
+            for record in batch:
+                key = (record.get("title"), record.get("link"))
+                if key in self._key_index:
+                    duplicates.append(key)
+                    continue
+                self._index_record(record)
+                self._salary_index.add(record)
+                self.keyword_index.add(self._doc_id(record), search_fields(record))
+                new_records.append(record)
+                added += 1
+            results[name] = {"added": added, "duplicates": duplicates}
+
+        if new_records:
+            new_records.sort(key=lambda x: x['title'])  # Сортировка по алфавиту названия
+            self.vacancies = list(heapq.merge(self.vacancies, new_records, key=lambda x: x['title']))
             self.save_to_file()
-        else:
-            print(f"Вакансия '{vacancy.title}' по ссылке {vacancy.link} уже существует.")
+        for name, result in results.items():
+            with open(os.path.join(self.queue_path, f"{name}.done"), "w", encoding="utf-8") as file:
+                json.dump(result, file, ensure_ascii=False)
+            os.remove(os.path.join(self.queue_path, f"{name}.json"))
+        # Итоги пакетов, чьи процессы завершились, не забрав их
+        for name in os.listdir(self.queue_path):
+            path = os.path.join(self.queue_path, name)
+            if name.endswith(".done") and time.time() - os.path.getmtime(path) > self.RESULT_TTL:
+                os.remove(path)
+
+    def _take_result(self, name: str) -> Tuple[int, List[Tuple[str, str]]]:
+        """Забирает итог своего пакета: количество добавленных записей и ключи дубликатов."""
+        path = os.path.join(self.queue_path, f"{name}.done")
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                result = json.load(file)
+        except FileNotFoundError:
+            return 0, []
+        os.remove(path)
+        return result["added"], [tuple(key) for key in result["duplicates"]]
 
-    def get_vacancies_by_salary(self, min_salary: float) -> List[Vacancy]:
-        """Возвращает вакансии с зарплатой не ниже указанной."""
-        return [Vacancy(**v) for v in self.vacancies if
-                float(Vacancy(**v).extract_salary().replace(" ", "")) >= min_salary]
+    def get_vacancies_by_salary(self, min_salary: float, max_salary: Optional[float] = None) -> List[Vacancy]:
+        """
+        Возвращает вакансии с зарплатой в рублях (середина вилки) не ниже min_salary
+        и не выше max_salary, от большей зарплаты к меньшей.
+        """
+        self._refresh()
+        return [Vacancy(**v) for v in self._salary_index.range(min_salary, max_salary)]
 
     def delete_vacancy(self, vacancy: Union[Dict[str, str], Vacancy]) -> None:
         """Удаляет вакансию из хранилища."""
         if isinstance(vacancy, dict):
-            self.vacancies = [v for v in self.vacancies if
-                              v.get("title") != vacancy.get("title") or v.get("link") != vacancy.get("link")]
-            self.save_to_file()
+            self.delete_vacancies([vacancy])
         else:
             print("Неверный формат, ожидается словарь.")
 
-    def save_to_file(self):
-        """Сохраняет данные в файл."""
-        with open(self.file_path, 'w', encoding='utf-8') as file:
-            json.dump(self.vacancies, file, ensure_ascii=False, indent=2)
-
-    def filter_vacancies(self, *vacancies: List[Dict[str, str]], filter_words: List[str]) -> List[Dict[str, str]]:
-        """Фильтрует вакансии по ключевым словам."""
-        filtered_vacancies = []
-        for vacancy in vacancies:
-            filtered_vacancies.extend([v for v in vacancy if self.word_match(v, filter_words)])
-        return filtered_vacancies
+    def delete_vacancies(self, vacancies: Iterable[Dict[str, str]]) -> int:
+        """Удаляет несколько вакансий одной записью в файл и возвращает количество удалённых."""
+        keys = {(vacancy.get("title"), vacancy.get("link")) for vacancy in vacancies}
+        with self._locked():
+            self._refresh()
+            self._commit_queue()
+            removed = set()
+            for key in keys:
+                record = self._key_index.get(key)
+                if record is not None:
+                    self._unindex_record(record)
+                    removed.add(key)
+            if removed:
+                self.vacancies = [v for v in self.vacancies if (v.get("title"), v.get("link")) not in removed]
+                self.save_to_file()
+        return len(removed)
 
-    def word_match(self, vacancy: Union[Vacancy, Dict[str, str]], filter_words: List[str]) -> bool:
-        """Проверяет, соответствует ли вакансия ключевым словам."""
-        if isinstance(vacancy, Vacancy):
-            vacancy_data = vacancy.extra_data
-        else:
-            vacancy_data = vacancy
-
-        return any(word.lower() in str(vacancy_data).lower() for word in filter_words)
-
-    def sort_vacancies(self, vacancies: List[Union[Dict[str, str], Vacancy]]) -> List[Union[Dict[str, str], Vacancy]]:
-        """Сортирует вакансии по заработной плате."""
-        return sorted(vacancies, key=lambda v: Vacancy(**v).extract_salary() if isinstance(v, dict) else v.extract_salary(), reverse=True)
+    def save_to_file(self):
+        """
+        Сохраняет данные в файл под блокировкой: запись во временный файл, fsync
+        и атомарное переименование, поэтому сбой не оставит файл пустым или частично записанным.
+        """
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        with self._locked(), metrics.span("json.save"):
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".vacancies-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(self.vacancies, file, ensure_ascii=False, indent=2)
+                    file.flush()
+                    os.fsync(file.fileno())
+                    metrics.count("json.bytes_written", file.tell())
+                os.replace(tmp_path, self.file_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._fsync_directory(directory)
+            metrics.count("json.rows_written", len(self.vacancies))
+            self._file_stat = self._stat()
+            self.keyword_index.save(self.index_path)
 
-    def get_top_vacancies(self, vacancies: List[Union[Dict[str, str], Vacancy]], top_n: int) -> List[Union[Dict[str, str], Vacancy]]:
-        """Возвращает топ N вакансий."""
-        return vacancies[:top_n]
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        """Сбрасывает на диск запись каталога, чтобы переименование пережило сбой питания."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
-    def print_vacancies(self, vacancies):
-        for vacancy in vacancies:
-            if isinstance(vacancy, Vacancy):
-                print(f"Название: {vacancy.title}")
-                print(f"Ссылка: {vacancy.link}")
-                print(f"Зарплата: {vacancy.extract_salary()}")
-                print(f"Требования: {vacancy.get_requirements()}")
-                print(f"Город: {vacancy.get_city()}")
-                print(f"Валюта: {vacancy.get_currency()}")
-                print(f"Работодатель: {vacancy.get_employer()}")
-                print("=" * 50)  # Добавим строку-разделитель
-            elif isinstance(vacancy, dict):
-                print(f"Название: {vacancy.get('title', 'Не указано')}")
-                print(f"Ссылка: {vacancy.get('link', 'Не указана')}")
-                print(f"Зарплата: {vacancy.get('salary', 'Не указана')}")
-                print(
-                    f"Требования: {vacancy.get('requirements', 'данные отсутствуют, проверьте информацию о требованиях в вакансии по ссылке')}")
-                print(f"Город: {vacancy.get('city', 'Не указан')}")
-                print(f"Валюта: {vacancy.get('currency', 'Не указана')}")
-                print(f"Работодатель: {vacancy.get('employer', 'Не указан')}")
-                print("=" * 50)  # Добавим строку-разделитель
\ No newline at end of file
+    def search_vacancies(self, query: str) -> List[Dict]:
+        """
+        Ищет сохранённые вакансии по индексу слов.
+        Запрос поддерживает AND/OR/NOT (И/ИЛИ/НЕ), скобки и "-слово".
+        """
+        self._refresh()
+        result = []
+        for doc_id in self.keyword_index.search(query):
+            title, link = json.loads(doc_id)
+            result.append(self._key_index[(title, link)])
+        result.sort(key=lambda x: x['title'])
+        return result
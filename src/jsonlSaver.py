@@ -0,0 +1,276 @@
+from vacancies import Vacancy
+from jsonSaver import AbstractVacancySaver, JSONSaver, SalaryIndex, to_record
+from instrumentation import metrics
+import json
+import os
+import tempfile
+from typing import List, Dict, Union, Iterable, Iterator, Optional, Tuple
+
+
+class JSONLSaver(AbstractVacancySaver):
+    """
+    Класс JSONLSaver реализует интерфейс AbstractVacancySaver поверх журнала JSON Lines.
+
+    Каждая добавленная вакансия дописывается в конец файла отдельной строкой,
+    удаление дописывает строку-надгробие ({"_deleted": true, "title": ..., "link": ...}).
+    В памяти хранится только индекс смещений: (название, ссылка) и id -> позиция строки в файле,
+    поэтому добавление и удаление стоят O(1) операций ввода-вывода, а отдельная запись
+    читается без загрузки всего файла. Индекс сохраняется рядом с журналом (<файл>.idx)
+    при закрытии и после сжатия; при открытии дочитывается только хвост журнала.
+
+    Сжатие (compact) переписывает журнал без удалённых записей. Оно запускается вручную
+    или автоматически, когда мусорных строк больше, чем живых, и не меньше compact_min_garbage.
+
+    Методы:
+    - add_vacancy(vacancy) / add_vacancies(vacancies) / add_records(records): Дописывают вакансии в журнал.
+    - get_record(title, link) / get_vacancy_by_id(vacancy_id): Читают одну запись по смещению.
+    - iter_records(): Перебирает живые записи.
+    - delete_vacancy(vacancy): Дописывает надгробие.
+    - compact(): Переписывает журнал без удалённых записей.
+    - close(): Сохраняет индекс и закрывает файлы.
+    """
+    def __init__(self, file_path: str = "vacancies.jsonl", compact_min_garbage: int = 1000):
+        self.file_path = file_path
+        self.compact_min_garbage = compact_min_garbage
+        self._entries: Dict[Tuple[str, str], Dict] = {}  # ключ -> {"offset", "id", "salary_rub"}
+        self._id_index: Dict[str, Dict] = {}
+        self._salary_index = SalaryIndex()
+        self._garbage = 0
+        self._size = 0
+        self._writer = None
+        self._open()
+
+    @property
+    def index_path(self) -> str:
+        """Путь к файлу индекса смещений."""
+        return f"{self.file_path}.idx"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "JSONLSaver":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open(self) -> None:
+        """Загружает сохранённый индекс и дочитывает журнал после него."""
+        if not os.path.exists(self.file_path):
+            open(self.file_path, "ab").close()
+        file_size = os.path.getsize(self.file_path)
+        start = 0
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if data["size"] <= file_size:
+                    for title, link, vacancy_id, offset, salary_rub in data["entries"]:
+                        self._add_entry((title, link), {"offset": offset, "id": vacancy_id, "salary_rub": salary_rub})
+                    self._garbage = data["garbage"]
+                    start = data["size"]
+            except (OSError, ValueError, KeyError):
+                self._reset_index()
+        self._salary_index = SalaryIndex(self._entries.values())
+        self._scan(start)
+
+    def _reset_index(self) -> None:
+        self._entries = {}
+        self._id_index = {}
+        self._salary_index = SalaryIndex()
+        self._garbage = 0
+
+    def _scan(self, start: int) -> None:
+        """
+        Читает журнал с позиции start и применяет записи к индексу.
+        Недописанная последняя строка (сбой во время записи) отрезается. Повреждённая строка
+        в середине журнала не отрезается вместе со следующими за ней записями:
+        выбрасывается ValueError.
+        """
+        offset = start
+        file_size = os.path.getsize(self.file_path)
+        with open(self.file_path, "rb") as file:
+            file.seek(start)
+            for line in file:
+                is_last = offset + len(line) == file_size
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("строка не завершена")
+                    record = json.loads(line)
+                except ValueError as e:
+                    if is_last:
+                        break
+                    raise ValueError(f"Журнал {self.file_path} повреждён на позиции {offset}: {e}") from e
+                self._apply(record, offset)
+                offset += len(line)
+        if offset < file_size:
+            os.truncate(self.file_path, offset)
+        self._size = offset
+
+    def _apply(self, record: Dict, offset: int) -> None:
+        """Применяет прочитанную строку журнала к индексу."""
+        key = (record.get("title"), record.get("link"))
+        if record.get("_deleted"):
+            self._garbage += 1
+            if self._remove_entry(key):
+                self._garbage += 1
+            return
+        if self._remove_entry(key):
+            self._garbage += 1
+        entry = {"offset": offset, "id": record.get("id"), "salary_rub": record.get("salary_rub")}
+        self._add_entry(key, entry)
+        self._salary_index.add(entry)
+
+    def _add_entry(self, key: Tuple[str, str], entry: Dict) -> None:
+        self._entries[key] = entry
+        if entry["id"] is not None:
+            self._id_index[str(entry["id"])] = entry
+
+    def _remove_entry(self, key: Tuple[str, str]) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        if entry["id"] is not None:
+            self._id_index.pop(str(entry["id"]), None)
+        self._salary_index.remove(entry)
+        return True
+
+    def _append(self, records: List[Dict]) -> List[int]:
+        """Дописывает записи в конец журнала одной операцией и возвращает их смещения."""
+        if self._writer is None:
+            self._writer = open(self.file_path, "ab")
+        offsets = []
+        chunks = []
+        offset = self._size
+        for record in records:
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            offsets.append(offset)
+            chunks.append(line)
+            offset += len(line)
+        with metrics.span("jsonl.append"):
+            self._writer.write(b"".join(chunks))
+            self._writer.flush()
+        metrics.count("jsonl.rows_written", len(records))
+        metrics.count("jsonl.bytes_written", offset - self._size)
+        self._size = offset
+        return offsets
+
+    def _read_at(self, offset: int) -> Dict:
+        """Читает одну запись по смещению."""
+        with open(self.file_path, "rb") as file:
+            file.seek(offset)
+            return json.loads(file.readline())
+
+    def contains(self, title: str, link: str) -> bool:
+        """Проверяет, есть ли вакансия с таким названием и ссылкой в хранилище."""
+        return (title, link) in self._entries
+
+    def get_record(self, title: str, link: str) -> Optional[Dict]:
+        """Возвращает сохранённую вакансию по названию и ссылке или None."""
+        entry = self._entries.get((title, link))
+        return self._read_at(entry["offset"]) if entry else None
+
+    def get_vacancy_by_id(self, vacancy_id) -> Optional[Dict]:
+        """Возвращает сохранённую вакансию по id или None."""
+        entry = self._id_index.get(str(vacancy_id))
+        return self._read_at(entry["offset"]) if entry else None
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Перебирает живые записи в порядке их добавления, не загружая файл целиком."""
+        live_offsets = {entry["offset"] for entry in self._entries.values()}
+        offset = 0
+        with open(self.file_path, "rb") as file:
+            for line in file:
+                if offset in live_offsets:
+                    yield json.loads(line)
+                offset += len(line)
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию в хранилище."""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> int:
+        """Дописывает новые вакансии в журнал и возвращает количество добавленных."""
+        return self.add_records(to_record(vacancy) for vacancy in vacancies)
+
+    def add_records(self, records: Iterable[Dict]) -> int:
+        """Дописывает готовые записи (формат JSONSaver), пропуская уже сохранённые."""
+        new_records = []
+        seen = set()
+        for record in records:
+            key = (record.get("title"), record.get("link"))
+            if key in self._entries or key in seen:
+                print(f"Вакансия '{key[0]}' по ссылке {key[1]} уже существует.")
+                continue
+            seen.add(key)
+            new_records.append(record)
+
+        if new_records:
+            for record, offset in zip(new_records, self._append(new_records)):
+                self._apply(record, offset)
+        return len(new_records)
+
+    def get_vacancies_by_salary(self, min_salary: float, max_salary: Optional[float] = None) -> List[Vacancy]:
+        """
+        Возвращает вакансии с зарплатой в рублях (середина вилки) не ниже min_salary
+        и не выше max_salary, от большей зарплаты к меньшей.
+        """
+        return [Vacancy(**self._read_at(entry["offset"])) for entry in self._salary_index.range(min_salary, max_salary)]
+
+    def delete_vacancy(self, vacancy: Union[Dict[str, str], Vacancy]) -> None:
+        """Удаляет вакансию из хранилища, дописывая надгробие."""
+        if isinstance(vacancy, Vacancy):
+            key = (vacancy.title, vacancy.link)
+        else:
+            key = (vacancy.get("title"), vacancy.get("link"))
+        if key not in self._entries:
+            return
+        tombstone = {"_deleted": True, "title": key[0], "link": key[1]}
+        self._apply(tombstone, self._append([tombstone])[0])
+        if self._garbage >= self.compact_min_garbage and self._garbage > len(self._entries):
+            self.compact()
+
+    def compact(self) -> None:
+        """Переписывает журнал, оставляя только живые записи."""
+        self.close()
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".vacancies-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for record in self.iter_records():
+                    file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._reset_index()
+        self._scan(0)
+        self.save_index()
+
+    def save_index(self) -> None:
+        """Сохраняет индекс смещений, чтобы при следующем открытии не читать журнал целиком."""
+        entries = [[title, link, entry["id"], entry["offset"], entry["salary_rub"]]
+                   for (title, link), entry in self._entries.items()]
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"size": self._size, "garbage": self._garbage, "entries": entries}, file, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def close(self) -> None:
+        """Сохраняет индекс и закрывает файл журнала."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.save_index()
+
+
+def convert_from_json(json_path: str = "vacancies.json", jsonl_path: str = "vacancies.jsonl") -> int:
+    """
+    Переносит вакансии из vacancies.json (формат JSONSaver) в журнал JSON Lines.
+    Возвращает количество перенесённых записей.
+    """
+    json_saver = JSONSaver(json_path)
+    json_saver.load_from_file()
+    with JSONLSaver(jsonl_path) as jsonl_saver:
+        return jsonl_saver.add_records(json_saver.vacancies)
@@ -0,0 +1,168 @@
+from functools import lru_cache
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Set
+
+
+TOKEN_RE = re.compile(r"[^\W_]+[+#]*")
+CYRILLIC_RE = re.compile("[а-я]")
+
+# Окончания, которые отбрасываются при нормализации слов (от длинных к коротким)
+RU_ENDINGS = (
+    "иями", "ями", "ами", "его", "ого", "ему", "ому", "ыми", "ими",
+    "ов", "ев", "ей", "ой", "ий", "ый", "ая", "яя", "ое", "ее", "ые", "ие", "ом", "ем", "ам", "ям", "ах", "ях",
+    "а", "я", "ы", "и", "у", "ю", "е", "о", "ь",
+)
+EN_ENDINGS = ("ing", "ers", "ies", "ed", "er", "es", "s")
+
+OPERATORS = {"AND": "AND", "И": "AND", "OR": "OR", "ИЛИ": "OR", "NOT": "NOT", "НЕ": "NOT"}
+# Части поискового запроса: скобки и слова (операторы или термы)
+QUERY_RE = re.compile(r"\(|\)|[^\s()]+")
+
+
+@lru_cache(maxsize=200000)
+def normalize_token(token: str) -> str:
+    """
+    Приводит слово к нормальной форме: нижний регистр, ё -> е
+    и отбрасывание типичных русских и английских окончаний.
+    Результат кэшируется: словарь вакансий намного меньше общего числа слов.
+    """
+    token = token.casefold().replace("ё", "е")
+    endings = RU_ENDINGS if CYRILLIC_RE.search(token) else EN_ENDINGS
+    for ending in endings:
+        if token.endswith(ending) and len(token) - len(ending) >= 3:
+            return token[:-len(ending)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Разбивает текст на нормализованные слова."""
+    return [normalize_token(token) for token in TOKEN_RE.findall(text or "")]
+
+
+class KeywordIndex:
+    """
+    Класс KeywordIndex - инвертированный индекс слов для поиска вакансий.
+
+    Для каждого нормализованного слова хранится множество идентификаторов документов,
+    в которых оно встречается. Запросы вида "python AND (django OR flask) NOT junior"
+    выполняются пересечением и объединением этих множеств без просмотра документов.
+
+    Методы:
+    - add(doc_id, texts): Индексирует документ.
+    - remove(doc_id): Удаляет документ из индекса.
+    - search(query): Возвращает идентификаторы документов, подходящих под запрос.
+    - search_any(phrases): Возвращает документы, содержащие хотя бы одну из фраз.
+    - save(path) / load(path): Сохраняет и загружает индекс.
+    """
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = {}
+        self.documents: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, doc_id: str, texts: Iterable[str]) -> None:
+        """Индексирует документ по переданным текстовым полям."""
+        if doc_id in self.documents:
+            self.remove(doc_id)
+        tokens = set()
+        for text in texts:
+            tokens.update(tokenize(text))
+        self.documents[doc_id] = tokens
+        for token in tokens:
+            self.postings.setdefault(token, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Удаляет документ из индекса."""
+        for token in self.documents.pop(doc_id, ()):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self.postings[token]
+
+    def _phrase(self, phrase: str) -> Set[str]:
+        """Документы, содержащие все слова фразы."""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return set()
+        postings = sorted((self.postings.get(token, set()) for token in tokens), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def search_any(self, phrases: Iterable[str]) -> Set[str]:
+        """Документы, содержащие хотя бы одну из фраз."""
+        result = set()
+        for phrase in phrases:
+            result |= self._phrase(phrase)
+        return result
+
+    def search(self, query: str) -> Set[str]:
+        """
+        Выполняет запрос с операторами AND/OR/NOT (или И/ИЛИ/НЕ, заглавными буквами) и скобками.
+        Слова без оператора между ними объединяются через AND, "-слово" означает NOT слово.
+        """
+        parts = QUERY_RE.findall(query)
+        tokens = []
+        for part in parts:
+            if part.startswith("-") and len(part) > 1:
+                tokens.extend(["NOT", part[1:]])
+            else:
+                tokens.append(OPERATORS.get(part, part))
+        result, _ = self._parse_or(tokens, 0)
+        return result
+
+    def _parse_or(self, tokens: List[str], position: int):
+        result, position = self._parse_and(tokens, position)
+        while position < len(tokens) and tokens[position] == "OR":
+            right, position = self._parse_and(tokens, position + 1)
+            result = result | right
+        return result, position
+
+    def _parse_and(self, tokens: List[str], position: int):
+        result, position = self._parse_not(tokens, position)
+        while position < len(tokens) and tokens[position] not in ("OR", ")"):
+            if tokens[position] == "AND":
+                position += 1
+            right, position = self._parse_not(tokens, position)
+            result = result & right
+        return result, position
+
+    def _parse_not(self, tokens: List[str], position: int):
+        if position >= len(tokens):
+            return set(), position
+        if tokens[position] == "NOT":
+            operand, position = self._parse_not(tokens, position + 1)
+            return set(self.documents) - operand, position
+        if tokens[position] == "(":
+            result, position = self._parse_or(tokens, position + 1)
+            if position < len(tokens) and tokens[position] == ")":
+                position += 1
+            return result, position
+        return self._phrase(tokens[position]), position + 1
+
+    def save(self, path: str) -> None:
+        """Сохраняет индекс в JSON-файл через временный файл."""
+        data = {"documents": {doc_id: sorted(tokens) for doc_id, tokens in self.documents.items()}}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "KeywordIndex":
+        """Загружает индекс из JSON-файла."""
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        index = cls()
+        for doc_id, tokens in data.get("documents", {}).items():
+            index.documents[doc_id] = set(tokens)
+            for token in tokens:
+                index.postings.setdefault(token, set()).add(doc_id)
+        return index
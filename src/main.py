@@ -1,8 +1,16 @@
 from src.hhAPI import HeadHunterAPI
 from src.sjAPI import SuperJobAPI
-from vacancies import Vacancy
 from jsonSaver import JSONSaver
+from aggregator import VacancyAggregator
+from httpCache import ResponseCache
+from instrumentation import instrument_run
+from pipeline import Pipeline, parse_vacancies, filter_by_keywords, tap, top_n
+from vacancies import Vacancy
 from typing import List
+import os
+
+# Сколько вакансий запрашивать у каждого источника
+MAX_RESULTS_PER_SOURCE = 500
 
 
 def get_user_keywords() -> List[str]:
@@ -17,45 +25,60 @@ def user_interaction():
     """
     Осуществляет взаимодействие с пользователем, позволяя выбрать API для поиска вакансий,
     вводить поисковый запрос, применять фильтры и выводить результаты.
-    Выводит топ N вакансий, предоставленных выбранным API, и сохраняет их в JSON-файл.
+    При выборе 'all' поиск выполняется во всех источниках одновременно.
+    Подходящие вакансии выводятся кратко по мере загрузки страниц,
+    в конце выводится топ N вакансий, которые сохраняются в JSON-файл.
     """
-    api_choice = input("Выберите API (вбейте 'hh' для hh.ru или 'sj' для superjob.ru): ").lower()
+    api_choice = input("Выберите API (вбейте 'hh' для hh.ru, 'sj' для superjob.ru или 'all' для всех): ").lower()
 
+    cache = ResponseCache()
+    aggregator = VacancyAggregator()
     if api_choice == 'hh':
-        job_api = HeadHunterAPI()
+        aggregator.register(HeadHunterAPI(cache=cache), name="hh.ru", max_results=MAX_RESULTS_PER_SOURCE)
     elif api_choice == 'sj':
-        job_api = SuperJobAPI()
+        aggregator.register(SuperJobAPI(cache=cache), name="superjob.ru",
+                            max_pages=MAX_RESULTS_PER_SOURCE // SuperJobAPI.MAX_PER_PAGE)
+    elif api_choice == 'all':
+        aggregator.register(HeadHunterAPI(cache=cache), name="hh.ru", max_results=MAX_RESULTS_PER_SOURCE)
+        try:
+            aggregator.register(SuperJobAPI(cache=cache), name="superjob.ru",
+                                max_pages=MAX_RESULTS_PER_SOURCE // SuperJobAPI.MAX_PER_PAGE)
+        except ValueError as e:
+            print(f"SuperJob пропущен: {e}")
     else:
         print("Неверный выбор API.")
         return
 
     json_saver = JSONSaver()
     search_query = input("Введите поисковый запрос: ")
-    vacancies = job_api.get_vacancies(search_query)
-
-    if not vacancies:
-        print("Нет вакансий, соответствующих заданным критериям.")
-        return
+    filter_words = get_user_keywords()
+    top_count = int(input("Введите количество вакансий для вывода: "))
 
-    all_vacancies = [Vacancy(**v) for v in vacancies]
+    def print_found(vacancy: Vacancy) -> None:
+        print(f"Найдена вакансия: {vacancy.title} ({vacancy.extract_salary()}) {vacancy.link}")
 
-    filter_words = get_user_keywords()
-    filtered_vacancies = json_saver.filter_vacancies(all_vacancies, filter_words=filter_words)
+    top_vacancies = (
+        Pipeline(aggregator.iter_pages(search_query))
+        .pipe(parse_vacancies)
+        .pipe(filter_by_keywords(filter_words))
+        .pipe(tap(print_found))
+        .pipe(top_n(top_count))
+        .run()
+    )
 
-    if not filtered_vacancies:
+    if not top_vacancies:
         print("Нет вакансий, соответствующих заданным критериям.")
         return
 
-    sorted_vacancies = json_saver.sort_vacancies(filtered_vacancies)
-    top_vacancies = json_saver.get_top_vacancies(sorted_vacancies, top_n=int(input("Введите количество вакансий для вывода: ")))
+    print("=" * 50)
     json_saver.print_vacancies(top_vacancies)
 
-    # Сохранение вакансий в JSON-файл
-    for vacancy in top_vacancies:
-        json_saver.add_vacancy(vacancy)
+    # Сохранение вакансий в JSON-файл одной записью
+    json_saver.add_vacancies(top_vacancies)
 
     print("Вакансии успешно сохранены в JSON-файл.")
 
-
 if __name__ == "__main__":
-    user_interaction()
+    # VACANCY_METRICS=run.json (или run.prom) - сохранить метрики запуска,
+    # VACANCY_PROFILE=profile.txt - профилировать запуск (cProfile и tracemalloc)
+    instrument_run(user_interaction, os.getenv("VACANCY_METRICS"), os.getenv("VACANCY_PROFILE"))
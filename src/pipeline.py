@@ -0,0 +1,116 @@
+import heapq
+from itertools import count
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+from vacancies import Vacancy
+from jsonSaver import AbstractVacancySaver, salary_key, keyword_phrases, matches_phrases
+
+Stage = Callable[[Iterable[Any]], Iterable[Any]]
+
+
+class Pipeline:
+    """
+    Класс Pipeline соединяет источник данных и этапы обработки в потоковую цепочку генераторов.
+
+    Этап - функция, которая принимает итерируемый поток и возвращает новый поток,
+    поэтому в цепочку можно добавлять собственные фильтры и преобразования.
+    Данные проходят по цепочке по одному элементу: память ограничена размером страницы
+    и буферами отдельных этапов (например, top_n хранит только N лучших вакансий).
+
+    Пример:
+        Pipeline(api.iter_pages(query)).pipe(parse_vacancies).pipe(filter_by_keywords(words)) \\
+            .pipe(top_n(10)).run(save_to(json_saver))
+    """
+    def __init__(self, source: Iterable[Any]):
+        self.source = source
+        self.stages: List[Stage] = []
+
+    def pipe(self, stage: Stage) -> "Pipeline":
+        """Добавляет этап в конец цепочки."""
+        self.stages.append(stage)
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        stream = self.source
+        for stage in self.stages:
+            stream = stage(stream)
+        return iter(stream)
+
+    def run(self, sink: Optional[Callable[[Iterable[Any]], Any]] = None) -> Any:
+        """Прогоняет данные через цепочку и передаёт результат приёмнику (по умолчанию - в список)."""
+        if sink is None:
+            return list(self)
+        return sink(self)
+
+
+def parse_vacancies(pages: Iterable[List[dict]]) -> Iterator[Vacancy]:
+    """Превращает страницы ответов API в объекты Vacancy."""
+    for page in pages:
+        for item in page:
+            yield Vacancy(**item)
+
+
+def filter_by_keywords(filter_words: List[str]) -> Stage:
+    """
+    Пропускает вакансии, в названии, требованиях, работодателе или городе которых
+    есть хотя бы одно из слов (фраз) - как JSONSaver.filter_vacancies.
+    """
+    phrases = keyword_phrases(filter_words)
+
+    def stage(vacancies: Iterable[Vacancy]) -> Iterator[Vacancy]:
+        for vacancy in vacancies:
+            if matches_phrases(vacancy, phrases):
+                yield vacancy
+    return stage
+
+
+def filter_by_salary(min_salary: Optional[float] = None, max_salary: Optional[float] = None) -> Stage:
+    """Пропускает вакансии с зарплатой в рублях (середина вилки) в заданном диапазоне."""
+    def stage(vacancies: Iterable[Vacancy]) -> Iterator[Vacancy]:
+        for vacancy in vacancies:
+            salary = vacancy.get_salary_rub()["mid"]
+            if salary is None:
+                continue
+            if (min_salary is None or salary >= min_salary) and (max_salary is None or salary <= max_salary):
+                yield vacancy
+    return stage
+
+
+def tap(callback: Callable[[Any], None]) -> Stage:
+    """Вызывает callback для каждого элемента и передаёт элемент дальше без изменений."""
+    def stage(items: Iterable[Any]) -> Iterator[Any]:
+        for item in items:
+            callback(item)
+            yield item
+    return stage
+
+
+def top_n(n: int, key: Callable[[Any], Any] = salary_key) -> Stage:
+    """
+    Оставляет N элементов с наибольшим ключом (по умолчанию - зарплатой в рублях).
+    Хранит в памяти не больше N элементов и отдаёт их, отсортированными по убыванию,
+    после окончания входного потока.
+    """
+    def stage(items: Iterable[Any]) -> Iterator[Any]:
+        if n <= 0:
+            return
+        heap = []
+        order = count()
+        for item in items:
+            # Номер элемента разрешает равенство ключей: раньше пришедший элемент считается больше
+            entry = (key(item), -next(order), item)
+            if len(heap) < n:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        for _, _, item in sorted(heap, key=lambda e: e[:2], reverse=True):
+            yield item
+    return stage
+
+
+def save_to(saver: AbstractVacancySaver) -> Callable[[Iterable[Vacancy]], List[Vacancy]]:
+    """Приёмник: сохраняет все вакансии потока одной пакетной записью и возвращает их."""
+    def sink(vacancies: Iterable[Vacancy]) -> List[Vacancy]:
+        vacancies = list(vacancies)
+        saver.add_vacancies(vacancies)
+        return vacancies
+    return sink
@@ -0,0 +1,267 @@
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import requests
+from instrumentation import metrics
+
+# Ответы, после которых GET-запрос можно повторить
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Запрос не отправлен: источник временно отключён после серии ошибок."""
+
+
+class TokenBucket:
+    """
+    Класс TokenBucket ограничивает частоту запросов к одному хосту.
+
+    Скорость подстраивается под ответы сервера: после 429 она уменьшается вдвое
+    (и запросы приостанавливаются на Retry-After), после каждого успешного ответа
+    понемногу растёт обратно до max_rate. rate=None означает отсутствие ограничения
+    до первого ответа 429: после него скорость ограничивается THROTTLED_RATE.
+    """
+    THROTTLED_RATE = 2.0
+
+    def __init__(self, rate: Optional[float], capacity: Optional[float] = None, min_rate: float = 0.2):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.capacity = capacity or max(1.0, rate or 1.0)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Блокирует поток, пока не появится свободный токен."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    delay = self.blocked_until - now
+                elif self.rate is None:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Снижает скорость после ответа 429 и при необходимости приостанавливает запросы."""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate is None:
+                self.rate = self.max_rate = self.THROTTLED_RATE
+            else:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            self._updated = now
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def success(self) -> None:
+        """Постепенно возвращает скорость к максимальной после успешного ответа."""
+        if self.rate is None:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class CircuitBreaker:
+    """
+    Класс CircuitBreaker отключает источник после failure_threshold ошибок подряд.
+    Через reset_timeout секунд предохранитель переходит в полуоткрытое состояние
+    и пропускает ровно один пробный запрос, остальные запросы отклоняются до его результата:
+    успех включает источник, ошибка отключает его снова.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = self.CLOSED
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != self.CLOSED
+
+    def allow(self) -> bool:
+        """Можно ли отправить запрос. В полуоткрытом состоянии разрешается только один пробный запрос."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class HostState:
+    """Ограничитель частоты, лимит одновременных запросов и предохранитель одного хоста."""
+    def __init__(self, rate: Optional[float], max_in_flight: int, failure_threshold: int, reset_timeout: float):
+        self.bucket = TokenBucket(rate)
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+
+class RequestScheduler:
+    """
+    Класс RequestScheduler отправляет GET-запросы всех клиентов API вакансий.
+
+    Для каждого хоста действуют свой адаптивный TokenBucket, лимит одновременных запросов
+    и CircuitBreaker. Ответы 429 и 5xx, а также ошибки соединения повторяются
+    с экспоненциальной задержкой со случайным разбросом (или по Retry-After). Ожидание
+    не превышает backoff_cap: если Retry-After больше, запрос не повторяется.
+    Если попытки исчерпаны, возвращается последний ответ (вызывающий код проверяет
+    его через raise_for_status) или выбрасывается последняя ошибка соединения.
+
+    Методы:
+    - configure_host(host, rate, max_in_flight): Задаёт лимиты хоста.
+    - get(session, url, **kwargs): Отправляет GET-запрос с повторами.
+    - stats(): Возвращает счётчики запросов, повторов, 429 и ошибок.
+    """
+    def __init__(self, default_rate: Optional[float] = None, default_max_in_flight: int = 8,
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0, timeout: float = 30.0):
+        self.default_rate = default_rate
+        self.default_max_in_flight = default_max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self._hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "throttled": 0, "errors": 0, "circuit_open": 0}
+
+    def configure_host(self, host: str, rate: Optional[float] = None, max_in_flight: Optional[int] = None,
+                       replace: bool = True) -> None:
+        """
+        Задаёт допустимую частоту (запросов в секунду) и число одновременных запросов для хоста.
+        При replace=False уже настроенный хост не меняется (так клиенты API задают лимиты
+        по умолчанию, не перетирая настройки общего планировщика).
+        """
+        with self._lock:
+            if not replace and host in self._hosts:
+                return
+            self._hosts[host] = HostState(rate, max_in_flight or self.default_max_in_flight,
+                                          self.failure_threshold, self.reset_timeout)
+
+    def _host(self, host: str) -> HostState:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = HostState(self.default_rate, self.default_max_in_flight,
+                                              self.failure_threshold, self.reset_timeout)
+            return self._hosts[host]
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+        metrics.count(f"http.{name}")
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """Задержка из заголовка Retry-After (секунды или HTTP-дата)."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def backoff(self, attempt: int) -> float:
+        """Экспоненциальная задержка с полным случайным разбросом."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """Отправляет GET-запрос с учётом лимитов хоста и повторяет его при временных ошибках."""
+        host = urlparse(url).netloc
+        state = self._host(host)
+        kwargs.setdefault("timeout", self.timeout)
+        response = None
+        error: Optional[Exception] = None
+
+        for attempt in range(self.max_retries + 1):
+            if not state.breaker.allow():
+                self._count("circuit_open")
+                raise CircuitOpenError(f"Источник {host} временно отключён после серии ошибок.")
+            state.bucket.acquire()
+            with state.in_flight:
+                self._count("requests")
+                try:
+                    with metrics.span("http.request"):
+                        response, error = session.get(url, **kwargs), None
+                    metrics.count("http.response_bytes", len(response.content))
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    response, error = None, e
+                except BaseException:
+                    # Неповторяемая ошибка: пробный запрос полуоткрытого предохранителя тоже завершён
+                    state.breaker.record_failure()
+                    raise
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                state.breaker.record_success()
+                state.bucket.success()
+                return response
+
+            delay, give_up = None, False
+            if response is not None and response.status_code == 429:
+                self._count("throttled")
+                delay = self.retry_after(response)
+                # Слишком долгое ожидание заняло бы поток и все запросы к хосту: запрос не повторяется
+                give_up = delay is not None and delay > self.backoff_cap
+                state.bucket.throttle(min(delay, self.backoff_cap) if delay is not None else None)
+                state.breaker.record_success()  # хост отвечает, это ограничение частоты, а не сбой
+            else:
+                self._count("errors")
+                state.breaker.record_failure()
+
+            if attempt == self.max_retries or give_up:
+                break
+            self._count("retries")
+            time.sleep(delay if delay is not None else self.backoff(attempt))
+
+        if response is not None:
+            return response
+        raise error
+
+    def stats(self) -> Dict[str, object]:
+        """Возвращает счётчики и текущую скорость и состояние каждого хоста."""
+        with self._lock:
+            hosts = {
+                host: {"rate": state.bucket.rate, "circuit": state.breaker.state}
+                for host, state in self._hosts.items()
+            }
+            return {**self._counters, "hosts": hosts}
@@ -1,32 +1,38 @@
-from abc import ABC, abstractmethod
 import os
-from typing import List, Optional
+from urllib.parse import urlparse
+from typing import Iterator, List, Optional
+from jobAPI import AbstractJobAPI
+from httpCache import ResponseCache
+from instrumentation import metrics
+from requestScheduler import RequestScheduler
+from vacancies import parse_published_at
 import requests
 
 
-class AbstractJobAPI(ABC):
-    """
-    Абстрактный класс AbstractJobAPI определяет интерфейс для работы с API вакансий.
-    """
-    @abstractmethod
-    def get_vacancies(self, search_query: str, **params) -> List[dict]:
-        """
-        Получает список вакансий по запросу.
-        """
-        pass
-
-
 class SuperJobAPI(AbstractJobAPI):
     """
     Класс SuperJobAPI реализует интерфейс AbstractJobAPI для взаимодействия с API SuperJob.
+    Если передан cache, ответы берутся из него и хранятся CACHE_TTL секунд.
+    Запросы отправляются через scheduler (RequestScheduler, можно передать общий) с повторами
+    при 429 и 5xx; если хост SuperJob в нём ещё не настроен, задаётся лимит requests_per_second.
+    Если после всех повторов запрос не удался, выбрасывается requests.exceptions.RequestException.
     """
     API_BASE_URL = "https://api.superjob.ru/2.0/"
+    CACHE_TTL = 900
+    MAX_PER_PAGE = 100
 
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[RequestScheduler] = None, requests_per_second: Optional[float] = 5.0,
+                 max_in_flight: int = 4):
         superjob_token = os.getenv("API_SUPERJOB")
         if not superjob_token:
             raise ValueError("API_SUPERJOB token is missing in environment variables.")
         self.api_key = superjob_token
+        self.session = session or requests.Session()
+        self.cache = cache
+        self.scheduler = scheduler or RequestScheduler()
+        self.scheduler.configure_host(urlparse(self.API_BASE_URL).netloc, requests_per_second, max_in_flight,
+                                      replace=False)
 
     def get_vacancies(
         self,
@@ -53,12 +59,54 @@ class SuperJobAPI(AbstractJobAPI):
             **kwargs,
         }
 
-        try:
-            response = requests.get(f"{self.API_BASE_URL}{endpoint}", headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            vacancies = data.get("objects", [])
-            return vacancies
-        except requests.exceptions.RequestException as e:
-            print(f"Error accessing SuperJob API: {e}")
-            return []
+        url = f"{self.API_BASE_URL}{endpoint}"
+
+        def send(extra_headers: Optional[dict] = None) -> requests.Response:
+            return self.scheduler.get(self.session, url, headers={**headers, **(extra_headers or {})}, params=params)
+
+        with metrics.span("sj.fetch_page"):
+            if self.cache is not None:
+                data = self.cache.fetch(url, params, send, ttl=self.CACHE_TTL)
+            else:
+                response = send()
+                response.raise_for_status()
+                data = response.json()
+        vacancies = data.get("objects", [])
+        metrics.count("sj.records_in", len(vacancies))
+        return vacancies
+
+    def iter_pages(
+        self,
+        search_query: str,
+        count: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[List[dict]]:
+        """
+        Отдаёт вакансии постранично по мере загрузки.
+        Без count и max_pages загружается только первая страница.
+        """
+        if count is None and max_pages is None:
+            yield self.get_vacancies(search_query, **kwargs)
+            return
+
+        count = max(1, min(count or self.MAX_PER_PAGE, self.MAX_PER_PAGE))
+        page = 0
+        while max_pages is None or page < max_pages:
+            vacancies = self.get_vacancies(search_query, page=page, count=count, **kwargs)
+            if vacancies:
+                yield vacancies
+            if len(vacancies) < count:
+                return
+            page += 1
+
+    def sync_params(self, since: Optional[float]) -> dict:
+        """Параметры запроса новых вакансий: сортировка по дате и date_published_from."""
+        params = {"order_field": "date", "order_direction": "desc"}
+        if since is not None:
+            params["date_published_from"] = int(since)
+        return params
+
+    def published_at(self, vacancy: dict) -> Optional[float]:
+        """Возвращает время публикации вакансии SuperJob (unix-время) или None."""
+        return parse_published_at(vacancy)
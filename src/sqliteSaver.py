@@ -0,0 +1,368 @@
+from vacancies import Vacancy
+from jsonSaver import AbstractVacancySaver, JSONSaver, to_record
+from instrumentation import metrics
+from keywordIndex import OPERATORS, QUERY_RE, tokenize
+import json
+import sqlite3
+from typing import List, Dict, Union, Iterable, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    vacancy_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    salary TEXT,
+    salary_from INTEGER,
+    salary_to INTEGER,
+    salary_rub INTEGER,
+    currency TEXT,
+    requirements TEXT,
+    city TEXT,
+    employer TEXT,
+    published_at REAL,
+    sources TEXT,
+    UNIQUE (source, vacancy_id)
+);
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary ON vacancies (salary_rub);
+CREATE INDEX IF NOT EXISTS idx_vacancies_city ON vacancies (city);
+CREATE INDEX IF NOT EXISTS idx_vacancies_employer ON vacancies (employer);
+CREATE INDEX IF NOT EXISTS idx_vacancies_published ON vacancies (published_at);
+CREATE INDEX IF NOT EXISTS idx_vacancies_title_link ON vacancies (title, link);
+
+"""
+
+# Полнотекстовый индекс хранит нормализованные слова (keywordIndex.tokenize) названия, требований,
+# работодателя и города, поэтому поиск совпадает с JSONSaver. Слова считает функция vacancy_words,
+# которую регистрирует SQLiteSaver.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5 (
+    words, tokenize = "unicode61 remove_diacritics 0 tokenchars '+#'"
+);
+CREATE TRIGGER IF NOT EXISTS vacancies_ai AFTER INSERT ON vacancies BEGIN
+    INSERT INTO vacancies_fts (rowid, words)
+    VALUES (new.id, vacancy_words(new.title, new.requirements, new.employer, new.city));
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_ad AFTER DELETE ON vacancies BEGIN
+    DELETE FROM vacancies_fts WHERE rowid = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS vacancies_au AFTER UPDATE ON vacancies BEGIN
+    DELETE FROM vacancies_fts WHERE rowid = old.id;
+    INSERT INTO vacancies_fts (rowid, words)
+    VALUES (new.id, vacancy_words(new.title, new.requirements, new.employer, new.city));
+END;
+"""
+
+COLUMNS = ("source", "vacancy_id", "title", "link", "salary", "salary_from", "salary_to", "salary_rub",
+           "currency", "requirements", "city", "employer", "published_at", "sources")
+
+
+
+def vacancy_words(*texts: Optional[str]) -> str:
+    """Нормализованные слова полей вакансии через пробел (текст для полнотекстового индекса)."""
+    return " ".join(token for text in texts for token in tokenize(text))
+
+
+def source_of(link: str) -> str:
+    """Определяет источник вакансии по ссылке."""
+    if "hh.ru" in link or "headhunter" in link:
+        return "hh"
+    if "superjob" in link:
+        return "sj"
+    return "other"
+
+
+class SQLiteSaver(AbstractVacancySaver):
+    """
+    Класс SQLiteSaver реализует интерфейс AbstractVacancySaver поверх базы SQLite.
+
+    Вакансия уникальна по паре (источник, id); зарплата в рублях, город, работодатель
+    и дата публикации проиндексированы, по нормализованным словам названия, требований,
+    работодателя и города построен полнотекстовый индекс FTS5. База работает в режиме WAL, поэтому читатели не блокируются писателем.
+    Пакет вакансий сохраняется одной транзакцией (upsert).
+
+    Если filter_vacancies, sort_vacancies и get_top_vacancies вызваны без списка вакансий,
+    они выполняются запросом к базе по индексам, иначе обрабатывают переданный список
+    общими методами AbstractVacancySaver.
+
+    Методы:
+    - add_vacancy(vacancy) / add_vacancies(vacancies): Сохраняют вакансии (upsert).
+    - get_vacancies_by_salary(min_salary, max_salary): Вакансии из диапазона зарплат.
+    - get_vacancies(city, employer, published_after, limit): Выборка по индексированным полям.
+    - search_vacancies(query): Полнотекстовый поиск с AND/OR/NOT.
+    - delete_vacancy(vacancy): Удаляет вакансию по названию и ссылке.
+    """
+    def __init__(self, db_path: str = "vacancies.db"):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.create_function("vacancy_words", -1, vacancy_words, deterministic=True)
+        self.connection.executescript(SCHEMA)
+        self._create_fts()
+
+    def _create_fts(self) -> None:
+        """Создаёт полнотекстовый индекс; индекс старого формата (название и требования) перестраивается."""
+        columns = [row["name"] for row in self.connection.execute("PRAGMA table_info(vacancies_fts)")]
+        if columns == ["words"]:
+            self.connection.executescript(FTS_SCHEMA)
+            return
+        with self.connection:
+            for trigger in ("vacancies_ai", "vacancies_ad", "vacancies_au"):
+                self.connection.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            self.connection.execute("DROP TABLE IF EXISTS vacancies_fts")
+        self.connection.executescript(FTS_SCHEMA)
+        with self.connection:
+            self.connection.execute("INSERT INTO vacancies_fts (rowid, words) SELECT id, "
+                                    "vacancy_words(title, requirements, employer, city) FROM vacancies")
+
+    def __enter__(self) -> "SQLiteSaver":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрывает соединение с базой."""
+        self.connection.close()
+
+    @staticmethod
+    def _to_row(record: Dict) -> tuple:
+        """Преобразует запись формата JSONSaver в строку таблицы."""
+        link = record.get("link") or ""
+        vacancy_id = record.get("id")
+        row = {
+            **record,
+            "source": record.get("source") or source_of(link),
+            "vacancy_id": str(vacancy_id) if vacancy_id is not None else link,
+            "sources": json.dumps(record["sources"], ensure_ascii=False) if record.get("sources") else None,
+        }
+        return tuple(row.get(column) for column in COLUMNS)
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> Dict:
+        """Преобразует строку таблицы в запись формата JSONSaver."""
+        record = {key: row[key] for key in row.keys() if key not in ("id", "vacancy_id")}
+        record["id"] = row["vacancy_id"]
+        record["sources"] = json.loads(row["sources"]) if row["sources"] else None
+        return record
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "", limit: Optional[int] = None) -> List[Dict]:
+        sql = "SELECT * FROM vacancies"
+        if where:
+            sql += f" WHERE {where}"
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        return [self._to_record(row) for row in self.connection.execute(sql, params)]
+
+    def add_vacancy(self, vacancy: Vacancy) -> None:
+        """Добавляет вакансию в хранилище."""
+        self.add_vacancies([vacancy])
+
+    def add_vacancies(self, vacancies: Iterable[Vacancy]) -> int:
+        """Сохраняет пакет вакансий одной транзакцией и возвращает количество новых вакансий."""
+        return self.add_records(to_record(vacancy) for vacancy in vacancies)
+
+    def add_records(self, records: Iterable[Dict]) -> int:
+        """
+        Сохраняет готовые записи (формат JSONSaver) одной транзакцией.
+        Уже сохранённые вакансии обновляются, но, как и в JSONSaver и JSONLSaver,
+        возвращается только количество добавленных вакансий.
+        """
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[2:])
+        sql = (f"INSERT INTO vacancies ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+               f"ON CONFLICT (source, vacancy_id) DO UPDATE SET {updates}")
+        with metrics.span("sqlite.upsert"), self.connection:
+            # Блокировка записи берётся до чтения максимума: строки других писателей не попадут в подсчёт
+            self.connection.execute("BEGIN IMMEDIATE")
+            # Новые строки получают id больше текущего максимума, обновлённые сохраняют свой id
+            last_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM vacancies").fetchone()[0]
+            cursor = self.connection.executemany(sql, (self._to_row(record) for record in records))
+            inserted = self.connection.execute("SELECT COUNT(*) FROM vacancies WHERE id > ?", (last_id,)).fetchone()[0]
+        metrics.count("sqlite.rows_written", max(cursor.rowcount, 0))
+        metrics.count("sqlite.rows_inserted", inserted)
+        return inserted
+
+    def get_vacancies_by_salary(self, min_salary: float, max_salary: Optional[float] = None) -> List[Vacancy]:
+        """
+        Возвращает вакансии с зарплатой в рублях (середина вилки) не ниже min_salary
+        и не выше max_salary, от большей зарплаты к меньшей.
+        """
+        where, params = ["salary_rub IS NOT NULL"], []
+        if min_salary is not None:
+            where.append("salary_rub >= ?")
+            params.append(min_salary)
+        if max_salary is not None:
+            where.append("salary_rub <= ?")
+            params.append(max_salary)
+        return [Vacancy(**r) for r in self._select(" AND ".join(where), tuple(params), "salary_rub DESC")]
+
+    def get_vacancies(self, city: Optional[str] = None, employer: Optional[str] = None,
+                      published_after: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Возвращает вакансии по городу, работодателю и дате публикации, от новых к старым."""
+        where, params = [], []
+        for column, value in (("city", city), ("employer", employer)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if published_after is not None:
+            where.append("published_at >= ?")
+            params.append(published_after)
+        return self._select(" AND ".join(where), tuple(params), "published_at DESC", limit)
+
+    @staticmethod
+    def _fts_term(phrase: str) -> str:
+        """
+        Переводит слово (фразу) в терм FTS5: все нормализованные слова фразы, как KeywordIndex._phrase.
+        Фраза без слов не совпадает ни с одной вакансией.
+        """
+        tokens = tokenize(phrase)
+        if not tokens:
+            return '""'
+        terms = ['"' + token.replace('"', '""') + '"' for token in tokens]
+        return terms[0] if len(terms) == 1 else "(" + " AND ".join(terms) + ")"
+
+    def _fts_parts(self, query: str) -> List[str]:
+        """Разбивает запрос с AND/OR/NOT (И/ИЛИ/НЕ), скобками и "-слово" на операторы и термы FTS5."""
+        parts = []
+        for part in QUERY_RE.findall(query):
+            if part in ("(", ")"):
+                parts.append(part)
+            elif part in OPERATORS:
+                parts.append(OPERATORS[part])
+            elif part.startswith("-") and len(part) > 1:
+                parts.extend(["NOT", self._fts_term(part[1:])])
+            else:
+                parts.append(self._fts_term(part))
+        return parts
+
+    def _fts_query(self, query: str) -> str:
+        """Переводит запрос в синтаксис FTS5."""
+        return " ".join(self._fts_parts(query))
+
+    @staticmethod
+    def _has_unary_not(parts: List[str]) -> bool:
+        """NOT в начале запроса, после скобки или другого оператора FTS5 не понимает."""
+        return any(part == "NOT" and (i == 0 or parts[i - 1] in ("(", "AND", "OR", "NOT"))
+                   for i, part in enumerate(parts))
+
+    def _id_set_sql(self, parts: List[str]) -> Tuple[str, list]:
+        """
+        Переводит запрос в SQL над множествами id: термы ищутся через FTS5,
+        AND/OR/NOT становятся INTERSECT/UNION/EXCEPT (NOT x - все вакансии, кроме x).
+        Разбор и нормализация слов повторяют KeywordIndex.search, поэтому результаты совпадают с JSONSaver.
+        """
+        params = []
+        empty = "SELECT id FROM vacancies WHERE 0"
+
+        def parse_or(position: int):
+            sql, position = parse_and(position)
+            while position < len(parts) and parts[position] == "OR":
+                right, position = parse_and(position + 1)
+                sql = f"SELECT id FROM ({sql}) UNION SELECT id FROM ({right})"
+            return sql, position
+
+        def parse_and(position: int):
+            sql, position = parse_not(position)
+            while position < len(parts) and parts[position] not in ("OR", ")"):
+                if parts[position] == "AND":
+                    position += 1
+                right, position = parse_not(position)
+                sql = f"SELECT id FROM ({sql}) INTERSECT SELECT id FROM ({right})"
+            return sql, position
+
+        def parse_not(position: int):
+            if position >= len(parts):
+                return empty, position
+            if parts[position] == "NOT":
+                operand, position = parse_not(position + 1)
+                return f"SELECT id FROM vacancies EXCEPT SELECT id FROM ({operand})", position
+            if parts[position] == "(":
+                sql, position = parse_or(position + 1)
+                if position < len(parts) and parts[position] == ")":
+                    position += 1
+                return sql, position
+            if parts[position] in ("AND", "OR", ")"):
+                return empty, position + 1
+            params.append(parts[position])
+            return "SELECT rowid AS id FROM vacancies_fts WHERE vacancies_fts MATCH ?", position + 1
+
+        sql, _ = parse_or(0)
+        return sql, params
+
+    def search_vacancies(self, query: str) -> List[Dict]:
+        """
+        Ищет сохранённые вакансии по названию, требованиям, работодателю и городу через FTS5
+        (с той же нормализацией слов, что и JSONSaver), результаты упорядочены
+        по релевантности. NOT в FTS5 бинарный, поэтому запросы с NOT в начале ("NOT junior",
+        "-junior") или после оператора выполняются как операции над множествами
+        ("все вакансии, кроме") и упорядочиваются по названию, как в JSONSaver.
+        """
+        parts = self._fts_parts(query)
+        if self._has_unary_not(parts):
+            id_sql, params = self._id_set_sql(parts)
+            sql, params = f"SELECT * FROM vacancies WHERE id IN ({id_sql}) ORDER BY title", tuple(params)
+        else:
+            sql = ("SELECT vacancies.* FROM vacancies_fts JOIN vacancies ON vacancies.id = vacancies_fts.rowid "
+                   "WHERE vacancies_fts MATCH ? ORDER BY rank")
+            params = (" ".join(parts),)
+        try:
+            rows = self.connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"Неверный поисковый запрос: {e}")
+            return []
+        return [self._to_record(row) for row in rows]
+
+    def delete_vacancy(self, vacancy: Union[Dict[str, str], Vacancy]) -> None:
+        """Удаляет вакансию из хранилища."""
+        if isinstance(vacancy, Vacancy):
+            key = (vacancy.title, vacancy.link)
+        else:
+            key = (vacancy.get("title"), vacancy.get("link"))
+        with self.connection:
+            self.connection.execute("DELETE FROM vacancies WHERE title = ? AND link = ?", key)
+
+    def filter_vacancies(self, *vacancies: List[Dict[str, str]], filter_words: List[str]) -> List[Dict[str, str]]:
+        """
+        Фильтрует вакансии по ключевым словам. Без списков вакансий ищет в базе:
+        вакансии, в названии, требованиях, работодателе или городе которых есть хотя бы одна из фраз.
+        """
+        if vacancies:
+            return super().filter_vacancies(*vacancies, filter_words=filter_words)
+        phrases = [self._fts_term(phrase) for phrase in filter_words if tokenize(phrase)]
+        if not phrases:
+            return []
+        sql = ("SELECT vacancies.* FROM vacancies_fts JOIN vacancies ON vacancies.id = vacancies_fts.rowid "
+               "WHERE vacancies_fts MATCH ? ORDER BY rank")
+        match = " OR ".join(phrases)
+        return [self._to_record(row) for row in self.connection.execute(sql, (match,))]
+
+    def sort_vacancies(self, vacancies: Optional[List[Union[Dict[str, str], Vacancy]]] = None) -> List[Union[Dict[str, str], Vacancy]]:
+        """Сортирует вакансии по зарплате в рублях; без списка возвращает все сохранённые вакансии."""
+        if vacancies is not None:
+            return super().sort_vacancies(vacancies)
+        return self._select(order="salary_rub IS NULL, salary_rub DESC")
+
+    def get_top_vacancies(self, vacancies: Optional[List[Union[Dict[str, str], Vacancy]]] = None,
+                          top_n: int = 10) -> List[Union[Dict[str, str], Vacancy]]:
+        """Возвращает топ N вакансий по зарплате в рублях; без списка - из базы по индексу зарплат."""
+        if vacancies is not None:
+            return super().get_top_vacancies(vacancies, top_n)
+        return self._select("salary_rub IS NOT NULL", order="salary_rub DESC", limit=top_n)
+
+
+def migrate_from_json(json_path: str = "vacancies.json", db_path: str = "vacancies.db") -> int:
+    """
+    Переносит вакансии из vacancies.json (формат JSONSaver) в базу SQLite.
+    Возвращает количество перенесённых записей.
+    """
+    json_saver = JSONSaver(json_path)
+    json_saver.load_from_file()
+    with SQLiteSaver(db_path) as sqlite_saver:
+        return sqlite_saver.add_records(json_saver.vacancies)
@@ -0,0 +1,115 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Обработчик маршрута: получает параметры запроса и возвращает JSON-ответ
+Route = Callable[[Dict[str, str]], dict]
+
+
+class StandInServer:
+    """
+    Класс StandInServer — локальная замена API вакансий для проверки клиентов без сети.
+
+    Сервер запускается в фоновом потоке на свободном порту (url — его адрес) и отвечает
+    на GET-запросы по маршрутам routes. Для проверки устойчивости можно задать задержку
+    latency и доли ответов 429 (throttle_rate, с заголовком Retry-After) и 503 (error_rate);
+    fail_first первых запросов всегда получают 503. Счётчики запросов и отказов — в stats.
+
+    Пример:
+        with StandInServer({"/vacancies": lambda query: {"items": []}}, throttle_rate=0.2) as server:
+            api.API_BASE_URL = f"{server.url}/"
+    """
+    def __init__(self, routes: Dict[str, Route], latency: float = 0.0, throttle_rate: float = 0.0,
+                 error_rate: float = 0.0, retry_after: Optional[float] = 1, fail_first: int = 0,
+                 seed: Optional[int] = None):
+        self.routes = routes
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _fault(self) -> Optional[int]:
+        """Определяет, какой отказ вернуть на очередной запрос (или None)."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.stats["requests"] <= self.fail_first:
+                status = 503
+            else:
+                roll = self._random.random()
+                if roll < self.throttle_rate:
+                    status = 429
+                elif roll < self.throttle_rate + self.error_rate:
+                    status = 503
+                else:
+                    return None
+            self.stats["throttled" if status == 429 else "errors"] += 1
+            return status
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, как у настоящих API
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                parsed = urlparse(self.path)
+                route = server.routes.get(parsed.path.rstrip("/") or "/")
+                if route is None:
+                    return self._send(404, {"error": "not found"})
+                status = server._fault()
+                if status == 429:
+                    headers = {"Retry-After": str(server.retry_after)} if server.retry_after is not None else {}
+                    return self._send(429, {"error": "too many requests"}, headers)
+                if status is not None:
+                    return self._send(status, {"error": "service unavailable"})
+                query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                self._send(200, route(query))
+
+            def _send(self, status: int, payload: dict, headers: Optional[dict] = None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,123 @@
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import requests
+from jobAPI import AbstractJobAPI
+from jsonSaver import AbstractVacancySaver
+from vacancies import Vacancy
+
+
+class SyncState:
+    """
+    Класс SyncState хранит состояние инкрементальной синхронизации для каждой пары
+    (источник, запрос): время публикации самой новой известной вакансии
+    и id последних полученных вакансий.
+    """
+    MAX_SEEN_IDS = 1000
+
+    def __init__(self, file_path: str = "sync_state.json"):
+        self.file_path = file_path
+        self.state: Dict[str, Dict[str, dict]] = {}
+        if os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                self.state = json.load(file)
+
+    @staticmethod
+    def query_key(search_query: str, params: Optional[dict] = None) -> str:
+        """Ключ запроса: нормализованный текст и отсортированные параметры."""
+        normalized = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+        return json.dumps([search_query.strip().casefold(), normalized], ensure_ascii=False)
+
+    def get(self, source: str, query_key: str) -> Tuple[Optional[float], set]:
+        """Возвращает время последней известной публикации и множество известных id."""
+        entry = self.state.get(source, {}).get(query_key)
+        if not entry:
+            return None, set()
+        return entry.get("last_published"), set(entry.get("seen_ids", []))
+
+    def update(self, source: str, query_key: str, last_published: Optional[float], new_ids: List[str]) -> None:
+        """Запоминает новые вакансии; самые новые id идут первыми, список ограничен MAX_SEEN_IDS."""
+        entry = self.state.setdefault(source, {}).setdefault(query_key, {"last_published": None, "seen_ids": []})
+        if last_published is not None and (entry["last_published"] is None or last_published > entry["last_published"]):
+            entry["last_published"] = last_published
+        new_id_set = set(new_ids)
+        seen_ids = new_ids + [i for i in entry["seen_ids"] if i not in new_id_set]
+        entry["seen_ids"] = seen_ids[:self.MAX_SEEN_IDS]
+        entry["synced_at"] = time.time()
+
+    def save(self) -> None:
+        """Сохраняет состояние в файл через временный файл."""
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.state, file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.file_path)
+
+
+class IncrementalSync:
+    """
+    Класс IncrementalSync загружает только вакансии, появившиеся после прошлого запуска.
+
+    Источник запрашивается с сортировкой от новых к старым и фильтром по дате публикации
+    (AbstractJobAPI.sync_params), пагинация останавливается на первой уже известной вакансии,
+    а в хранилище одной пакетной записью добавляются только новые вакансии.
+    """
+    def __init__(self, saver: AbstractVacancySaver, state: Optional[SyncState] = None):
+        self.saver = saver
+        self.state = state or SyncState()
+        self.errors: Dict[Tuple[str, str], Exception] = {}
+
+    def sync(self, api: AbstractJobAPI, source: str, search_query: str, **params) -> List[Vacancy]:
+        """
+        Синхронизирует один запрос одного источника и возвращает новые вакансии.
+        Если страницу не удалось загрузить (requests.exceptions.RequestException) или записать
+        вакансии в хранилище, ошибка передаётся вызывающему коду, а состояние не меняется.
+        """
+        key = self.state.query_key(search_query, params)
+        last_published, seen_ids = self.state.get(source, key)
+
+        new_items = []
+        pages = api.iter_pages(search_query, **{**params, **api.sync_params(last_published)})
+        try:
+            for page in pages:
+                known = False
+                for item in page:
+                    if str(item.get("id")) in seen_ids:
+                        known = True
+                        break
+                    new_items.append(item)
+                if known:
+                    break
+        finally:
+            pages.close()
+
+        # Состояние сдвигается только после успешной записи: если запись не удалась,
+        # следующий запуск загрузит эти вакансии снова
+        vacancies = [Vacancy(**item) for item in new_items]
+        if vacancies:
+            self.saver.add_vacancies(vacancies)
+
+        published = [t for t in (api.published_at(item) for item in new_items) if t is not None]
+        self.state.update(source, key, max(published) if published else None,
+                          [str(item.get("id")) for item in new_items])
+        return vacancies
+
+    def sync_all(self, queries: Iterable[Tuple[AbstractJobAPI, str, str, dict]]) -> Dict[Tuple[str, str], int]:
+        """
+        Синхронизирует набор сохранённых запросов (api, источник, запрос, параметры)
+        и сохраняет состояние. Возвращает количество новых вакансий по каждому запросу.
+        Запросы, которые не удалось загрузить, пропускаются (ошибки сохраняются в errors)
+        и будут повторены при следующем запуске.
+        """
+        result = {}
+        self.errors = {}
+        try:
+            for api, source, search_query, params in queries:
+                try:
+                    result[(source, search_query)] = len(self.sync(api, source, search_query, **params))
+                except requests.exceptions.RequestException as e:
+                    self.errors[(source, search_query)] = e
+                    print(f"Ошибка синхронизации '{search_query}' ({source}): {e}")
+        finally:
+            self.state.save()
+        return result
@@ -1,28 +1,135 @@
 from bs4 import BeautifulSoup
+from datetime import datetime
 from io import StringIO
+import html
+import re
+from typing import Dict, Optional, Tuple
+from instrumentation import metrics
+
+NO_REQUIREMENTS = "данные отсутствуют, проверьте информацию о требованиях в вакансии по ссылке"
+# Значение работодателя и города, если источник их не указал
+NOT_SPECIFIED = "Не указан"
+
+# Сниппеты короче этого размера очищаются от тегов регулярным выражением, без BeautifulSoup
+FAST_HTML_LIMIT = 2000
+TAG_RE = re.compile(r"<!--.*?-->|</?[A-Za-z][^<>]*>", re.DOTALL)
+
+
+# Курсы валют к рублю. Таблицу можно заменить через Vacancy.currency_rates.
+DEFAULT_CURRENCY_RATES = {
+    "RUR": 1.0,
+    "RUB": 1.0,
+    "USD": 90.0,
+    "EUR": 100.0,
+    "KZT": 0.19,
+    "UAH": 2.3,
+    "BYR": 28.0,
+    "BYN": 28.0,
+    "UZS": 0.0073,
+    "AZN": 53.0,
+    "GEL": 33.0,
+    "KGS": 1.0,
+}
+
+
+def html_to_text(text: str) -> str:
+    """
+    Убирает HTML-теги из текста.
+    Короткие сниппеты (как в ответах API) обрабатываются регулярным выражением,
+    длинные документы - через BeautifulSoup.
+    """
+    if "<" not in text and "&" not in text:
+        return text
+    if len(text) < FAST_HTML_LIMIT and "<script" not in text and "<style" not in text:
+        return html.unescape(TAG_RE.sub("", text))
+    # Используем StringIO для создания объекта файлового потока
+    with StringIO(text) as file_stream:
+        soup = BeautifulSoup(file_stream, 'html.parser')
+        return soup.get_text()
+
+
+SALARY_FROM_RE = re.compile(r"от\s*(\d[\d\s]*)")
+SALARY_TO_RE = re.compile(r"до\s*(\d[\d\s]*)")
+
+
+def parse_salary_text(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Разбирает зарплату из строки Vacancy.extract_salary ("от X до Y", "от X", "до Y").
+    Записи старого формата JSONSaver хранят зарплату только в таком виде.
+    """
+    bounds = []
+    for pattern in (SALARY_FROM_RE, SALARY_TO_RE):
+        match = pattern.search(text or "")
+        bounds.append(int(re.sub(r"\s", "", match.group(1))) if match else None)
+    return bounds[0], bounds[1]
+
+
+def parse_published_at(data: dict) -> Optional[float]:
+    """
+    Возвращает время публикации вакансии (unix-время) или None.
+    hh.ru присылает published_at строкой ISO 8601, SuperJob - date_published числом,
+    JSONSaver сохраняет published_at числом.
+    """
+    published = data.get("published_at")
+    if published is None:
+        published = data.get("date_published")
+    if isinstance(published, (int, float)):
+        return float(published)
+    try:
+        return datetime.strptime(published, "%Y-%m-%dT%H:%M:%S%z").timestamp()
+    except (TypeError, ValueError):
+        return None
 
 
 class Vacancy:
     """
     Класс Vacancy представляет вакансию и содержит методы для обработки данных о вакансии.
+    Принимает как ответ API (hh.ru, SuperJob), так и запись, сохранённую JSONSaver.
+
+    Из ответа API извлекаются только используемые поля, исходный словарь сохраняется
+    в extra_data лишь при keep_raw=True. Очищенный текст требований вычисляется
+    при первом обращении и запоминается.
     """
-    def __init__(self, **kwargs):
+    __slots__ = ("id", "title", "link", "salary", "requirements", "sources", "published_at", "extra_data",
+                 "_city", "_currency", "_employer", "_requirements_text")
+
+    currency_rates: Dict[str, float] = DEFAULT_CURRENCY_RATES
+
+    def __init__(self, keep_raw: bool = False, **kwargs):
         """
         Инициализация объекта Vacancy.
         """
         self.id = kwargs.get("id")
-        self.title = kwargs.get("name") or kwargs.get("profession", "")
+        self.title = kwargs.get("name") or kwargs.get("profession") or kwargs.get("title", "")
         self.link = kwargs.get("alternate_url") or kwargs.get("link", "")
 
         # Проверяем наличие ключа "salary" и его значения
         salary_data = kwargs.get("salary")
-        self.salary = {
-            "from": salary_data.get("from") if salary_data and isinstance(salary_data, dict) else None,
-            "to": salary_data.get("to") if salary_data and isinstance(salary_data, dict) else None,
-        }
+        if salary_data and isinstance(salary_data, dict):
+            self.salary = {
+                "from": salary_data.get("from"),
+                "to": salary_data.get("to"),
+            }
+        else:
+            # SuperJob присылает payment_from/payment_to (0 - не указана), JSONSaver - salary_from/salary_to
+            salary_from = kwargs.get("payment_from") or kwargs.get("salary_from")
+            salary_to = kwargs.get("payment_to") or kwargs.get("salary_to")
+            if salary_from is None and salary_to is None and isinstance(salary_data, str):
+                # Запись старого формата JSONSaver: зарплата сохранена только строкой
+                salary_from, salary_to = parse_salary_text(salary_data)
+            self.salary = {"from": salary_from, "to": salary_to}
 
-        self.requirements = kwargs.get("snippet", {}).get("requirement", "") or kwargs.get("work", "")
-        self.extra_data = kwargs  # Сохраняем дополнительные данные
+        self.requirements = ((kwargs.get("snippet") or {}).get("requirement") or kwargs.get("work")
+                             or kwargs.get("requirements") or "")
+        self._city = self._extract_city(kwargs)
+        self._currency = self._extract_currency(kwargs)
+        self._employer = self._extract_employer(kwargs)
+        self._requirements_text = None
+        self.published_at = parse_published_at(kwargs)
+        self.sources = kwargs.get("sources")  # Ссылки на копии вакансии на других сайтах (см. dedup)
+        self.extra_data = kwargs if keep_raw else {}  # Исходные данные сохраняются только по запросу
+        if metrics.enabled:
+            metrics.count("vacancy.created")
 
     def extract_salary(self) -> str:
         """
@@ -41,65 +148,100 @@ class Vacancy:
         elif salary_to is not None:
             return f"до {salary_to}"
         else:
-            # В случае SuperJob используем поле "payment_from"
-            salary_from_sj = self.extra_data.get("payment_from", None)
-            if salary_from_sj is not None:
-                return f"от {salary_from_sj}"
-            else:
-                return "зарплата не указана"
+            return "зарплата не указана"
+
+    @classmethod
+    def to_rub(cls, amount: Optional[float], currency: Optional[str]) -> Optional[int]:
+        """
+        Переводит сумму в рубли по таблице currency_rates.
+        Если валюта не указана, сумма считается рублёвой; неизвестная валюта даёт None.
+        """
+        if amount is None:
+            return None
+        rate = cls.currency_rates.get((currency or "RUR").upper())
+        if rate is None:
+            return None
+        return int(round(amount * rate))
+
+    def get_salary_rub(self) -> Dict[str, Optional[int]]:
+        """
+        Возвращает зарплату в рублях: нижнюю и верхнюю границы и середину вилки.
+        """
+        currency = self.get_currency()
+        if currency == "Не указана":
+            currency = None
+        salary_from = self.to_rub(self.salary.get("from"), currency)
+        salary_to = self.to_rub(self.salary.get("to"), currency)
+
+        if salary_from is not None and salary_to is not None:
+            salary_mid = (salary_from + salary_to) // 2
+        else:
+            salary_mid = salary_from if salary_from is not None else salary_to
+        return {"from": salary_from, "to": salary_to, "mid": salary_mid}
 
     def get_requirements(self) -> str:
         """Возвращает требования к кандидату в формате строки."""
-        try:
-            snippet_requirements = self.extra_data.get('snippet', {}).get('requirement', '')
-            work_requirements = self.extra_data.get('work', '')
-            requirements = snippet_requirements or work_requirements
-
-            if requirements:
-                # Используем StringIO для создания объекта файлового потока
-                with StringIO(requirements) as file_stream:
-                    soup = BeautifulSoup(file_stream, 'html.parser')
-                    return soup.get_text()
-            else:
-                return "данные отсутствуют, проверьте информацию о требованиях в вакансии по ссылке"
-        except Exception as e:
-            print(f"Ошибка при обработке HTML: {e}")
-            return "данные отсутствуют, проверьте информацию о требованиях в вакансии по ссылке"
+        if self._requirements_text is None:
+            try:
+                with metrics.span("vacancy.html_to_text"):
+                    self._requirements_text = html_to_text(self.requirements) if self.requirements else NO_REQUIREMENTS
+            except Exception as e:
+                print(f"Ошибка при обработке HTML: {e}")
+                self._requirements_text = NO_REQUIREMENTS
+        return self._requirements_text
 
     def get_city(self) -> str:
         """Возвращает город вакансии."""
-        area_data = self.extra_data.get('area', {}) if 'area' in self.extra_data else {}
-        town_data = self.extra_data.get('town', {}) if 'town' in self.extra_data else {}
-        return area_data.get('name', town_data.get('title', 'Не указан'))
+        return self._city
 
     def get_currency(self) -> str:
         """
         Возвращает валюту вакансии.
         """
-        if self.extra_data:
-            salary_data = self.extra_data.get("salary")
-            if salary_data and "currency" in salary_data:
-                return salary_data["currency"]
-            elif "currency" in self.extra_data:
-                return self.extra_data["currency"]
-            else:
-                return "Не указана"
-        else:
-            return "Не указана"
+        return self._currency
 
     def get_employer(self) -> str:
         """Возвращает название работодателя."""
-        if 'employer' in self.extra_data:
+        return self._employer
+
+    @staticmethod
+    def _extract_city(data: dict) -> str:
+        """Извлекает город из данных вакансии."""
+        area_data = data.get('area') or {}
+        town_data = data.get('town') or {}
+        return area_data.get('name', town_data.get('title', data.get('city', NOT_SPECIFIED)))
+
+    @staticmethod
+    def _extract_currency(data: dict) -> str:
+        """Извлекает валюту из данных вакансии."""
+        salary_data = data.get("salary")
+        if isinstance(salary_data, dict) and salary_data.get("currency"):
+            return salary_data["currency"]
+        elif "currency" in data:
+            return data["currency"]
+        else:
+            return "Не указана"
+
+    @staticmethod
+    def _extract_employer(data: dict) -> str:
+        """Извлекает название работодателя из данных вакансии."""
+        if isinstance(data.get('employer'), dict):
             # Используем employer для HH
-            return self.extra_data['employer'].get('name', 'Не указан')
-        elif 'firm_name' in self.extra_data:
+            return data['employer'].get('name', NOT_SPECIFIED)
+        elif data.get('employer'):
+            # Запись, сохранённая JSONSaver
+            return data['employer']
+        elif 'firm_name' in data:
             # Используем firm_name для SuperJob
-            return self.extra_data.get('firm_name', 'Не указан')
+            return data.get('firm_name', NOT_SPECIFIED)
         else:
-            return 'Не указан'
+            return NOT_SPECIFIED
 
     def __lt__(self, other) -> bool:
         """
-        Сравнивает вакансии по заработной плате.
+        Сравнивает вакансии по заработной плате в рублях (середине вилки).
+        Вакансии без зарплаты считаются меньше любых других.
         """
-        return self.extract_salary() < other.extract_salary()
\ No newline at end of file
+        self_salary = self.get_salary_rub()["mid"]
+        other_salary = other.get_salary_rub()["mid"]
+        return (self_salary if self_salary is not None else -1) < (other_salary if other_salary is not None else -1)
\ No newline at end of file
@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from batchHarvest import BatchHarvester, open_store  # noqa: E402
+from benchData import generate_hh_items, generate_sj_objects, hh_routes, sj_routes  # noqa: E402
+from hhAPI import HeadHunterAPI  # noqa: E402
+from instrumentation import metrics  # noqa: E402
+from requestScheduler import RequestScheduler  # noqa: E402
+from sjAPI import SuperJobAPI  # noqa: E402
+from standInServer import StandInServer  # noqa: E402
+
+
+class TestBatchHarvester(unittest.TestCase):
+    def test_failed_source_is_counted(self):
+        os.environ.setdefault("API_SUPERJOB", "test")
+        scheduler = RequestScheduler(max_retries=1, backoff_base=0.001, backoff_cap=0.01)
+        with StandInServer(hh_routes(generate_hh_items(20))) as hh_server, \
+                StandInServer(sj_routes(generate_sj_objects(20)), error_rate=1.0) as sj_server, \
+                tempfile.TemporaryDirectory() as directory:
+            hh_api = HeadHunterAPI(scheduler=scheduler)
+            hh_api.API_BASE_URL = f"{hh_server.url}/"
+            sj_api = SuperJobAPI(scheduler=scheduler)
+            sj_api.API_BASE_URL = f"{sj_server.url}/2.0/"
+            saver = open_store(os.path.join(directory, "vacancies.db"))
+            try:
+                harvester = BatchHarvester(saver, {"hh": hh_api, "sj": sj_api}, fetch_workers=2,
+                                           processes=1, max_results=20)
+                summary = harvester.run([{"query": "python", "source": "all", "filters": []}])
+            finally:
+                saver.close()
+        self.assertEqual(summary["fetch_failures"], 1)
+        self.assertEqual(summary["fetched"], 20)
+        self.assertGreater(sj_server.stats["errors"], 0)
+
+    def test_pool_metrics_are_merged(self):
+        with StandInServer(hh_routes(generate_hh_items(30))) as server, tempfile.TemporaryDirectory() as directory:
+            api = HeadHunterAPI(scheduler=RequestScheduler())
+            api.API_BASE_URL = f"{server.url}/"
+            saver = open_store(os.path.join(directory, "vacancies.db"))
+            metrics.reset()
+            metrics.enable()
+            try:
+                harvester = BatchHarvester(saver, {"hh": api}, fetch_workers=2, processes=2, chunk_size=10)
+                harvester.run([{"query": "python", "filters": []}])
+            finally:
+                metrics.disable()
+                saver.close()
+        summary = metrics.summary()
+        self.assertEqual(summary["counters"]["vacancy.created"], 30)
+        self.assertEqual(summary["timers"]["harvest.normalize_chunk"]["count"], 3)
+        self.assertIn("vacancy.html_to_text", summary["timers"])
+        self.assertIn("harvest.normalize", summary["timers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from dedup import DuplicateDetector, exact_key  # noqa: E402
+
+
+def record(link: str, employer: str = "Не указан", city: str = "Не указан") -> dict:
+    return {"title": "Курьер", "link": link, "requirements": "", "employer": employer, "city": city}
+
+
+class TestDuplicateDetector(unittest.TestCase):
+    def test_no_exact_key_without_employer_or_city(self):
+        self.assertIsNone(exact_key(record("h4")))
+        self.assertIsNone(exact_key(record("h4", employer="Ромашка")))
+        self.assertIsNotNone(exact_key(record("h4", employer="Ромашка", city="Москва")))
+
+    def test_same_title_without_employer_is_not_merged(self):
+        detector = DuplicateDetector()
+        first, second = record("h4"), record("h5")
+        self.assertIs(detector.add(first), first)
+        self.assertIs(detector.add(second), second)
+        self.assertNotIn("sources", first)
+
+    def test_same_employer_title_and_city_is_merged(self):
+        detector = DuplicateDetector()
+        first = record("h4", employer="Ромашка", city="Москва")
+        second = record("s7", employer="ромашка", city="Москва")
+        detector.add(first)
+        self.assertIs(detector.add(second), first)
+        self.assertEqual(first["sources"], ["h4", "s7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
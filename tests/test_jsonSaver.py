@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from jsonSaver import JSONSaver  # noqa: E402
+from vacancies import Vacancy  # noqa: E402
+
+PROCESSES = 8
+BATCHES = 20
+
+
+def vacancy(number: int) -> Vacancy:
+    return Vacancy(id=str(number), name=f"Вакансия {number}", alternate_url=f"https://hh.ru/vacancy/{number}")
+
+
+def add_batches(path: str, worker: int) -> int:
+    """Добавляет пакеты, пересекающиеся с пакетами других процессов, и возвращает число добавленных."""
+    saver = JSONSaver(path)
+    added = 0
+    for batch in range(BATCHES):
+        start = (worker + batch) * 5
+        added += saver.add_vacancies([vacancy(number) for number in range(start, start + 10)])
+    return added
+
+
+class TestJSONSaverConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "vacancies.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_concurrent_add_vacancies_from_processes(self):
+        with multiprocessing.Pool(PROCESSES) as pool:
+            added = pool.starmap(add_batches, [(self.path, worker) for worker in range(PROCESSES)])
+
+        expected = (PROCESSES - 1 + BATCHES - 1) * 5 + 10
+        saver = JSONSaver(self.path)
+        saver.load_from_file()
+        self.assertEqual(len(saver.vacancies), expected)
+        self.assertEqual(len({v["link"] for v in saver.vacancies}), expected)
+        self.assertEqual(sum(added), expected)
+        self.assertEqual([name for name in os.listdir(saver.queue_path)], [])
+
+    def test_duplicate_check_sees_other_instance(self):
+        first, second = JSONSaver(self.path), JSONSaver(self.path)
+        self.assertEqual(first.add_vacancies([vacancy(1), vacancy(2)]), 2)
+        self.assertTrue(second.contains("Вакансия 1", "https://hh.ru/vacancy/1"))
+
+        self.assertEqual(first.delete_vacancies([{"title": "Вакансия 1", "link": "https://hh.ru/vacancy/1"}]), 1)
+        self.assertFalse(second.contains("Вакансия 1", "https://hh.ru/vacancy/1"))
+        self.assertEqual(second.add_vacancies([vacancy(1), vacancy(2)]), 1)
+        self.assertEqual(first.get_vacancy_by_id("1")["title"], "Вакансия 1")
+        self.assertEqual([v["title"] for v in first.search_vacancies("вакансия")], ["Вакансия 1", "Вакансия 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from jsonlSaver import JSONLSaver  # noqa: E402
+
+
+def record(number: int) -> dict:
+    return {"id": str(number), "title": f"Вакансия {number}", "link": f"https://hh.ru/vacancy/{number}",
+            "salary_rub": 100000 + number}
+
+
+class TestJSONLSaverRecovery(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "vacancies.jsonl")
+        with JSONLSaver(self.path) as saver:
+            saver.add_records([record(number) for number in range(3)])
+        os.remove(f"{self.path}.idx")  # журнал читается целиком, как после сбоя до сохранения индекса
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_torn_last_line_is_truncated(self):
+        size = os.path.getsize(self.path)
+        with open(self.path, "ab") as file:
+            file.write('{"id": "3", "title": "Ваканс'.encode("utf-8"))
+
+        with JSONLSaver(self.path) as saver:
+            self.assertEqual(len(saver), 3)
+            self.assertEqual(os.path.getsize(self.path), size)
+            saver.add_records([record(3)])
+            self.assertEqual(saver.get_vacancy_by_id("3")["title"], "Вакансия 3")
+
+    def test_corruption_in_the_middle_raises(self):
+        with open(self.path, "rb") as file:
+            lines = file.readlines()
+        lines[1] = b"{broken\n"
+        with open(self.path, "wb") as file:
+            file.writelines(lines)
+        size = os.path.getsize(self.path)
+
+        with self.assertRaises(ValueError):
+            JSONLSaver(self.path)
+        self.assertEqual(os.path.getsize(self.path), size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import unittest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from benchData import generate_hh_items, generate_sj_objects, hh_routes, sj_routes  # noqa: E402
+from hhAPI import HeadHunterAPI  # noqa: E402
+from requestScheduler import CircuitBreaker, CircuitOpenError, RequestScheduler, TokenBucket  # noqa: E402
+from sjAPI import SuperJobAPI  # noqa: E402
+from standInServer import StandInServer  # noqa: E402
+
+
+def fast_scheduler(**kwargs) -> RequestScheduler:
+    """Планировщик без долгих пауз между повторами."""
+    return RequestScheduler(**{"backoff_base": 0.001, "backoff_cap": 0.01, **kwargs})
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def test_retries_503_until_success(self):
+        with StandInServer(hh_routes(generate_hh_items(5)), fail_first=2) as server:
+            scheduler = fast_scheduler()
+            response = scheduler.get(requests.Session(), f"{server.url}/vacancies")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(server.stats["requests"], 3)
+        stats = scheduler.stats()
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["errors"], 2)
+
+    def test_429_throttles_host_and_waits_retry_after(self):
+        with StandInServer(hh_routes(generate_hh_items(5)), throttle_rate=1.0, retry_after=0.2) as server:
+            scheduler = fast_scheduler(max_retries=1, backoff_cap=1.0)
+            host = server.url.split("://")[1]
+            scheduler.configure_host(host, rate=10.0)
+            started = time.monotonic()
+            response = scheduler.get(requests.Session(), f"{server.url}/vacancies")
+            elapsed = time.monotonic() - started
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(elapsed, 0.2)
+        stats = scheduler.stats()
+        self.assertEqual(stats["throttled"], 2)
+        self.assertEqual(stats["retries"], 1)
+        self.assertLess(stats["hosts"][host]["rate"], 10.0)
+        self.assertEqual(stats["hosts"][host]["circuit"], CircuitBreaker.CLOSED)
+
+    def test_long_retry_after_is_not_waited(self):
+        with StandInServer(hh_routes(generate_hh_items(5)), throttle_rate=1.0, retry_after=3600) as server:
+            scheduler = fast_scheduler(backoff_cap=0.2)
+            host = server.url.split("://")[1]
+            started = time.monotonic()
+            response = scheduler.get(requests.Session(), f"{server.url}/vacancies")
+            elapsed = time.monotonic() - started
+            bucket = scheduler._host(host).bucket
+        self.assertEqual(response.status_code, 429)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(server.stats["requests"], 1)
+        self.assertLessEqual(bucket.blocked_until - time.monotonic(), 0.2)
+
+    def test_unlimited_host_is_limited_after_429(self):
+        bucket = TokenBucket(None)
+        bucket.throttle()
+        self.assertEqual(bucket.rate, TokenBucket.THROTTLED_RATE)
+        bucket.throttle()
+        self.assertEqual(bucket.rate, TokenBucket.THROTTLED_RATE / 2)
+
+    def test_circuit_opens_after_failures(self):
+        with StandInServer(hh_routes(generate_hh_items(5)), error_rate=1.0) as server:
+            scheduler = fast_scheduler(max_retries=1, failure_threshold=2)
+            scheduler.get(requests.Session(), f"{server.url}/vacancies")
+            with self.assertRaises(CircuitOpenError):
+                scheduler.get(requests.Session(), f"{server.url}/vacancies")
+        self.assertEqual(server.stats["requests"], 2)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allow())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+
+class TestClientErrors(unittest.TestCase):
+    def test_hh_raises_when_retries_exhausted(self):
+        with StandInServer(hh_routes(generate_hh_items(5)), error_rate=1.0) as server:
+            api = HeadHunterAPI(scheduler=fast_scheduler(max_retries=1))
+            api.API_BASE_URL = f"{server.url}/"
+            with self.assertRaises(requests.exceptions.HTTPError):
+                api.get_vacancies("python")
+
+    def test_sj_raises_when_retries_exhausted(self):
+        os.environ.setdefault("API_SUPERJOB", "test")
+        with StandInServer(sj_routes(generate_sj_objects(5)), error_rate=1.0) as server:
+            api = SuperJobAPI(scheduler=fast_scheduler(max_retries=1))
+            api.API_BASE_URL = f"{server.url}/2.0/"
+            with self.assertRaises(requests.exceptions.HTTPError):
+                api.get_vacancies("python")
+
+    def test_sj_host_has_default_rate(self):
+        os.environ.setdefault("API_SUPERJOB", "test")
+        scheduler = RequestScheduler()
+        SuperJobAPI(scheduler=scheduler)
+        self.assertEqual(scheduler.stats()["hosts"]["api.superjob.ru"]["rate"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
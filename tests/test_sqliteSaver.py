@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from jsonSaver import JSONSaver  # noqa: E402
+from sqliteSaver import SQLiteSaver  # noqa: E402
+
+RECORDS = [
+    {"id": "1", "title": "Python разработчик", "link": "https://hh.ru/vacancy/1", "requirements": "Django",
+     "employer": "Яндекс", "city": "Москва", "salary_rub": 100000},
+    {"id": "2", "title": "Java developer", "link": "https://hh.ru/vacancy/2", "requirements": "Spring",
+     "employer": "Сбер", "city": "Казань", "salary_rub": 200000},
+    {"id": "3", "title": "Python developer", "link": "https://hh.ru/vacancy/3", "requirements": "C++ и SQL",
+     "employer": "Ozon", "city": "Санкт-Петербург", "salary_rub": 300000},
+]
+
+
+class TestSQLiteSaverSearch(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sqlite = SQLiteSaver(os.path.join(self.directory.name, "vacancies.db"))
+        self.json = JSONSaver(os.path.join(self.directory.name, "vacancies.json"))
+        self.assertEqual(self.sqlite.add_records(RECORDS), 3)
+        self.json.add_records([dict(record) for record in RECORDS])
+
+    def tearDown(self):
+        self.sqlite.close()
+        self.directory.cleanup()
+
+    def test_search_matches_json_saver(self):
+        for query in ("python NOT Москва", "Москва", "разработчиков", "NOT python", "-Казань python",
+                      "python OR java", "c++", "(java OR sql) AND NOT москве"):
+            with self.subTest(query=query):
+                self.assertEqual(sorted(r["id"] for r in self.sqlite.search_vacancies(query)),
+                                 sorted(r["id"] for r in self.json.search_vacancies(query)))
+
+    def test_filter_store_uses_all_search_fields(self):
+        self.assertEqual(sorted(r["id"] for r in self.sqlite.filter_vacancies(filter_words=["Москва", "c++"])),
+                         ["1", "3"])
+
+    def test_add_records_counts_only_inserts(self):
+        updated = dict(RECORDS[0], salary_rub=150000)
+        new = dict(RECORDS[0], id="4", link="https://hh.ru/vacancy/4")
+        self.assertEqual(self.sqlite.add_records([updated, new]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()